@@ -1,76 +1,145 @@
+import os
 import logging
 import re
+from collections import namedtuple
+import metrics
 
-logging.basicConfig(filename='agent_builder.log', level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
+Intent = namedtuple('Intent', ['name', 'pattern', 'plan', 'run'])
+AgentPlan = namedtuple('AgentPlan', ['agent_type', 'args'])
+
+# Intents in priority order; the first one whose pattern matches the prompt wins
+intents = []
+intents_by_name = {}
+_router = None
+
+def register_intent(name, pattern, run, plan=None, before=None):
+    """Register a prompt intent.
+
+    pattern is a regex searched case-insensitively anywhere in the prompt, plan(prompt)
+    returns the tool arguments once at agent creation and run(tools, args) performs a run.
+    Intents are tried in registration order unless before names an intent to take priority over.
+    """
+    global _router
+    intent = Intent(name, pattern, plan or (lambda prompt: {}), run)
+    remaining = [existing for existing in intents if existing.name != name]
+    if before is None:
+        position = len(remaining)
+    else:
+        position = next((i for i, existing in enumerate(remaining) if existing.name == before), None)
+        if position is None:
+            raise ValueError(f"Unknown intent {before!r} for before")
+    remaining.insert(position, intent)
+    intents[:] = remaining
+    intents_by_name[name] = intent
+    _router = None
+
+def _compile_router():
+    # Every intent becomes an optional lookahead anchored at the start, so a single
+    # match reports all intents present in the prompt and priority picks between them
+    source = '^' + ''.join(f"(?:(?=.*?(?P<i{i}>{intent.pattern}))|)" for i, intent in enumerate(intents))
+    return re.compile(source, re.IGNORECASE | re.DOTALL), list(intents)
+
+def route(prompt):
+    global _router
+    router = _router
+    if router is None:
+        router = _router = _compile_router()
+    pattern, routed_intents = router
+    match = pattern.match(prompt)
+    for i, intent in enumerate(routed_intents):
+        if match.group(f"i{i}") is not None:
+            return intent
+    return None
+
+def plan_prompt(prompt):
+    intent = route(prompt)
+    if not intent:
+        return AgentPlan("unknown", {})
+    return AgentPlan(intent.name, intent.plan(prompt))
+
+HACKER_NEWS_URL = os.getenv('HACKER_NEWS_URL', 'https://news.ycombinator.com/')
+EMAIL_RECIPIENT_PATTERN = re.compile(r"email them to\s+(\S+)", re.IGNORECASE)
+PDF_PATH_PATTERN = re.compile(r"(?:^|\s)(\S+\.pdf)(?=\s|$)", re.IGNORECASE)
+
+def _plan_hacker_news(prompt):
+    recipients = EMAIL_RECIPIENT_PATTERN.findall(prompt)
+    return {"url": HACKER_NEWS_URL, "recipient": recipients[-1] if recipients else "user@example.com"}
+
+def _run_hacker_news(tools, args):
+    headlines = tools["scrape_headlines"]({"url": args["url"]})
+    if headlines.get("error"):
+        return {"output": f"Failed to scrape headlines: {headlines['output']}"}
+    email_result = tools["send_email"]({
+        "recipient": args["recipient"],
+        "subject": "Hacker News Top Headlines",
+        "body": f"Top 5 headlines from Hacker News:\n{headlines['output']}"
+    })
+    return {"output": f"Top 5 headlines from Hacker News:\n{headlines['output']}\n{email_result['output']}"}
+
+def _run_twitter_summarization(tools, args):
+    tweets = tools["scrape_tweets"]({"username": args["username"]})
+    if tweets.get("error"):
+        return {"output": f"Failed to scrape tweets: {tweets['output']}"}
+    tweet_text = tweets["output"].lower()
+    topics = []
+    if "tesla" in tweet_text:
+        topics.append("Tesla")
+    if "spacex" in tweet_text:
+        topics.append("SpaceX")
+    if "mars" in tweet_text:
+        topics.append("Mars exploration")
+    if "ai" in tweet_text:
+        topics.append("AI")
+    if not topics:
+        topics.append("various topics")
+    summary = f"Summary of Elon Musk's tweets:\n- Discussed {', '.join(topics)}."
+    logger.info(f"Posting summary of Elon Musk's tweets: {summary}")
+    return {"output": f"Elon Musk's tweets:\n{tweets['output']}\n{summary}\nPosted summary to log."}
+
+def _plan_pdf_summarization(prompt):
+    match = PDF_PATH_PATTERN.search(prompt)
+    return {"file_path": match.group(1) if match else None}
+
+def _run_pdf_summarization(tools, args):
+    if not args["file_path"]:
+        return {"output": "Error: PDF file path not found in prompt. Please upload a PDF and try again."}
+    summary = tools["summarize_pdf"]({"file_path": args["file_path"]})
+    return {"output": summary["output"]}
+
+register_intent("pdf_summarization", r"summarize (?:the )?pdf", _run_pdf_summarization, _plan_pdf_summarization)
+register_intent(
+    "twitter_summarization",
+    r"elon musk(?=.*?(?:tweets|summary))|(?:tweets|summary)(?=.*?elon musk)",
+    _run_twitter_summarization,
+    lambda prompt: {"username": "@elonmusk"}
+)
+register_intent("hacker_news", r"scrape top headlines", _run_hacker_news, _plan_hacker_news)
+
 class SimpleAgentExecutor:
     def __init__(self, tools, prompt):
         self.tools = tools
         self.prompt = prompt
-        # Determine the agent type based on the prompt
-        prompt_lower = prompt.lower()
-        if "summarize the pdf" in prompt_lower or "summarize pdf" in prompt_lower:
-            self.agent_type = "pdf_summarization"
-        elif "elon musk" in prompt_lower and ("tweets" in prompt_lower or "summary" in prompt_lower):
-            self.agent_type = "twitter_summarization"
-        elif "scrape top headlines" in prompt_lower:
-            self.agent_type = "hacker_news"
-        else:
-            self.agent_type = "unknown"
+        # Route and parse the prompt once so scheduled runs reuse the plan
+        self.plan = plan_prompt(prompt)
+        self.agent_type = self.plan.agent_type
 
     def invoke(self, input_data):
-        prompt = input_data.get("input", self.prompt).lower()
-        logger.info(f"SimpleAgentExecutor (type: {self.agent_type}) processing prompt: {prompt}")
-
-        if self.agent_type == "hacker_news" or "scrape top headlines" in prompt:
-            headlines = self.tools["scrape_headlines"]({"url": "https://news.ycombinator.com/"})
-            if "error" in headlines["output"].lower():
-                return {"output": f"Failed to scrape headlines: {headlines['output']}"}
-            email_recipient = "user@example.com"
-            if "email them to" in prompt:
-                email_part = prompt.split("email them to")[-1].strip()
-                email_recipient = email_part.split()[0] if email_part else email_recipient
-            email_result = self.tools["send_email"]({
-                "recipient": email_recipient,
-                "subject": "Hacker News Top Headlines",
-                "body": f"Top 5 headlines from Hacker News:\n{headlines['output']}"
-            })
-            return {"output": f"Top 5 headlines from Hacker News:\n{headlines['output']}\n{email_result['output']}"}
-
-        elif self.agent_type == "twitter_summarization" or ("elon musk" in prompt and ("tweets" in prompt or "summary" in prompt)):
-            tweets = self.tools["scrape_tweets"]({"username": "@elonmusk"})
-            if "error" in tweets["output"].lower():
-                return {"output": f"Failed to scrape tweets: {tweets['output']}"}
-            tweet_text = tweets["output"].lower()
-            topics = []
-            if "tesla" in tweet_text:
-                topics.append("Tesla")
-            if "spacex" in tweet_text:
-                topics.append("SpaceX")
-            if "mars" in tweet_text:
-                topics.append("Mars exploration")
-            if "ai" in tweet_text:
-                topics.append("AI")
-            if not topics:
-                topics.append("various topics")
-            summary = f"Summary of Elon Musk's tweets:\n- Discussed {', '.join(topics)}."
-            logger.info(f"Posting summary of Elon Musk's tweets: {summary}")
-            return {"output": f"Elon Musk's tweets:\n{tweets['output']}\n{summary}\nPosted summary to log."}
-
-        elif self.agent_type == "pdf_summarization" and ("summarize the pdf" in prompt or "summarize pdf" in prompt):
-            file_path = None
-            for word in prompt.split():
-                if word.endswith(".pdf"):
-                    file_path = word
-                    break
-            if not file_path:
-                return {"output": "Error: PDF file path not found in prompt. Please upload a PDF and try again."}
-            summary = self.tools["summarize_pdf"]({"file_path": file_path})
-            return {"output": summary["output"]}
-
-        else:
-            return {"output": "Prompt not recognized. Try asking about Hacker News headlines, Elon Musk's tweets, or PDF summarization."}
+        prompt = input_data.get("input", self.prompt)
+        plan = self.plan
+        if prompt != self.prompt:
+            # Ad-hoc prompts are routed on the fly, keeping this agent's intent if none matches
+            plan = plan_prompt(prompt)
+            if plan.agent_type == "unknown" and self.agent_type != "unknown":
+                plan = AgentPlan(self.agent_type, intents_by_name[self.agent_type].plan(prompt))
+        logger.info(f"SimpleAgentExecutor (type: {plan.agent_type}) processing prompt: {prompt}")
+
+        intent = intents_by_name.get(plan.agent_type)
+        with metrics.timed(metrics.AGENT_INVOKE_SECONDS, metrics.AGENT_INVOKE_ERRORS, plan.agent_type, timing_key="invoke_ms"):
+            if not intent:
+                return {"output": "Prompt not recognized. Try asking about Hacker News headlines, Elon Musk's tweets, or PDF summarization."}
+            return intent.run(self.tools, plan.args)
 
 def create_agent(tools, prompt):
     logger.info(f"Creating simple agent for prompt: {prompt}")
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+import requests
+from werkzeug.serving import make_server
+
+from fixtures import make_pdf
+from stubs import HNStub, SMTPStub, TwitterStub
+
+PROMPTS = {
+    'hacker_news': "Scrape top headlines from Hacker News and email them to bench@example.com",
+    'twitter_summarization': "Summarize Elon Musk's tweets",
+    'pdf_summarization': "Summarize the PDF at {file_path}"
+}
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': len(latencies) / elapsed if elapsed else None,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else None,
+        'p50_ms': percentile(latencies, 0.5) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+        'max_ms': latencies[-1] * 1000 if latencies else None
+    }
+
+def load(send, count, concurrency):
+    """Call send(session, i) count times from concurrency threads; a request fails on an exception or a status >= 400."""
+    local = threading.local()
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def one(i):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            ok = send(session, i).status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(count)))
+    return summarize(latencies, errors[0], time.perf_counter() - start)
+
+def time_calls(call, count):
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for i in range(count):
+        call_start = time.perf_counter()
+        result = call(i)
+        latencies.append(time.perf_counter() - call_start)
+        if isinstance(result, dict) and result.get('error'):
+            errors += 1
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+def bench_tools(tools, hn_url, twitter, pdf_paths, repeat):
+    results = {
+        # The dict-returning variants carry the error key that time_calls counts
+        'scrape_headlines': time_calls(lambda i: tools._scrape_headlines(hn_url), repeat),
+        'send_email': time_calls(lambda i: tools._send_email('bench@example.com', 'Benchmark', f"Message {i}", wait=True), repeat),
+        'send_emails': time_calls(
+            lambda i: tools.send_emails([{'recipient': 'bench@example.com', 'subject': 'Benchmark', 'body': f"Message {i}.{n}"} for n in range(10)]),
+            max(1, repeat // 10)
+        )
+    }
+    if twitter:
+        results['scrape_tweets'] = time_calls(lambda i: tools.scrape_tweets('@elonmusk'), repeat)
+    for pages, paths in pdf_paths.items():
+        # Distinct files miss the summary cache; the second pass over the same files hits it
+        results[f'summarize_pdf[pages={pages}]'] = time_calls(lambda i: tools.summarize_pdf(paths[i % len(paths)]), len(paths))
+        results[f'summarize_pdf_cached[pages={pages}]'] = time_calls(lambda i: tools.summarize_pdf(paths[i % len(paths)]), len(paths))
+    return results
+
+def write_pdfs(folder, pages, count, seed_offset):
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"bench-{pages}-{i}.pdf")
+        with open(path, 'wb') as f:
+            f.write(make_pdf(pages, seed=seed_offset + i))
+        paths.append(path)
+    return paths
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Flask endpoints and time each tool against local stub servers")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+    parser.add_argument('--repeat', type=int, default=20, help="Calls per tool")
+    parser.add_argument('--pdf-pages', type=int, nargs='+', default=[1, 10, 100], help="Page counts of the generated PDF fixtures")
+    parser.add_argument('--output', help="Write the JSON results to this file as well as stdout")
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output) if args.output else None
+    workdir = tempfile.mkdtemp(prefix='agent-bench-')
+    hn, smtp = HNStub().start(), SMTPStub().start()
+    twitter = TwitterStub().start() if TwitterStub.available() else None
+
+    # Everything main.py writes (uploads, agents.db, caches, logs) goes to the work directory,
+    # and tool caches are disabled so each call reaches the stubs
+    os.chdir(workdir)
+    os.environ.update({
+        'HACKER_NEWS_URL': hn.url,
+        'HEADLINES_TTL_SECONDS': '0',
+        'TOOL_CACHE_TTL_SECONDS': '0',
+        'TWEETS_TTL_SECONDS': '0',
+        'SMTP_HOST': smtp.host,
+        'SMTP_PORT': str(smtp.port),
+        'SMTP_STARTTLS': 'false',
+        'SMTP_EMAIL': 'bench@example.com',
+        'SMTP_PASSWORD': 'bench',
+        'TWITTER_CONSUMER_KEY': 'bench',
+        'TWITTER_CONSUMER_SECRET': 'bench',
+        'TWITTER_ACCESS_TOKEN': 'bench',
+        'TWITTER_ACCESS_TOKEN_SECRET': 'bench',
+        'SCHEDULER_MODE': 'local',
+        'LOG_FILE': os.path.join(workdir, 'bench.log')
+    })
+    if twitter:
+        os.environ.update({'TWITTER_API_HOST': twitter.host, 'REQUESTS_CA_BUNDLE': twitter.cert_path})
+
+    import main as app_main
+    import tools
+
+    server = make_server('127.0.0.1', 0, app_main.create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    fixtures_dir = os.path.join(workdir, 'fixtures')
+    os.makedirs(fixtures_dir)
+    pdf_paths = {pages: write_pdfs(fixtures_dir, pages, max(2, args.repeat // 4), pages * 100000) for pages in args.pdf_pages}
+
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'concurrency': args.concurrency,
+        'requests_per_endpoint': args.requests,
+        'twitter_stub': twitter is not None,
+        'endpoints': {},
+        'tools': {}
+    }
+    endpoints = results['endpoints']
+
+    try:
+        for pages in args.pdf_pages:
+            uploads = [make_pdf(pages, seed=1000000 + pages * 100000 + i) for i in range(args.requests)]
+            endpoints[f'upload_pdf[pages={pages}]'] = load(
+                lambda session, i: session.post(f"{base_url}/upload_pdf", files={'file': (f"bench-{i}.pdf", uploads[i], 'application/pdf')}),
+                args.requests, args.concurrency
+            )
+        # The agent gets a file of its own, so its summaries do not warm the cache the uncached tool pass measures
+        agent_pdf = os.path.join(fixtures_dir, 'agent.pdf')
+        with open(agent_pdf, 'wb') as f:
+            f.write(make_pdf(args.pdf_pages[0], seed=2000000))
+        pdf_prompt = PROMPTS['pdf_summarization'].format(file_path=agent_pdf)
+        prompts = [PROMPTS['hacker_news'], pdf_prompt] + ([PROMPTS['twitter_summarization']] if twitter else [])
+
+        agent_ids = []
+        def generate(session, i):
+            response = session.post(f"{base_url}/generate_agent", json={'prompt': prompts[i % len(prompts)]})
+            if response.ok:
+                agent_ids.append(response.json()['agent_id'])
+            return response
+        endpoints['generate_agent'] = load(generate, args.requests, args.concurrency)
+        endpoints['run_agent'] = load(
+            lambda session, i: session.get(f"{base_url}/run_agent/{agent_ids[i % len(agent_ids)]}"),
+            args.requests, args.concurrency
+        )
+        endpoints['list_agents'] = load(lambda session, i: session.get(f"{base_url}/list_agents?limit=100"), args.requests, args.concurrency)
+
+        results['tools'] = bench_tools(tools, hn.url, twitter is not None, pdf_paths, args.repeat)
+        results['stub_requests'] = {'hn': hn.requests, 'smtp_messages': smtp.requests, 'twitter': twitter.requests if twitter else 0}
+    finally:
+        server.shutdown()
+        app_main.stop_services()
+        for stub in (hn, smtp, twitter):
+            if stub:
+                stub.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if output_path:
+        with open(output_path, 'w') as f:
+            f.write(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from tools import headline_engines, LXML_AVAILABLE
+from fixtures import hn_front_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# tracemalloc only sees Python allocations, so libxml2's tree (lxml, and bs4 on top of it)
+# is invisible to it. Peak RSS covers native memory too, so each engine also parses once in
+# a fresh interpreter: a tiny page first loads the parser modules, then the peak is reset
+# and its growth over one parse of the fixture is reported. This needs Linux's
+# /proc/self/clear_refs; elsewhere peak_rss_kib is null.
+RSS_CHILD = """
+import json
+from tools import headline_engines
+
+def status(field):
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field + ':'))
+
+parse = headline_engines[{engine!r}]
+with open({path!r}, encoding='utf-8') as f:
+    html = f.read()
+parse('<html><body></body></html>', {limit!r})
+try:
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    before = status('VmRSS')
+except OSError:
+    print(json.dumps(None))
+else:
+    parse(html, {limit!r})
+    print(json.dumps(status('VmHWM') - before))
+"""
+
+def peak_rss_kib(engine, path, limit):
+    completed = subprocess.run(
+        [sys.executable, '-c', RSS_CHILD.format(engine=engine, path=path, limit=limit)],
+        env=dict(os.environ, PYTHONPATH=ROOT_DIR), capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def load_fixtures(paths):
+    if not paths:
+        paths = sorted(os.path.join(FIXTURES_DIR, name) for name in os.listdir(FIXTURES_DIR) if name.endswith('.html'))
+    fixtures = {os.path.basename(path): open(path, encoding='utf-8').read() for path in paths}
+    if not fixtures:
+        fixtures = {'generated-30': hn_front_page(30), 'generated-300': hn_front_page(300)}
+    return fixtures
+
+def bench_engine(parse, html, limit, repeat):
+    """Time parse on html; python_heap_peak_kib is what tracemalloc sees and excludes native memory."""
+    parse(html, limit)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(html, limit)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(html, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    return {
+        'mean_ms': sum(timings) / len(timings) * 1000,
+        'p50_ms': timings[len(timings) // 2] * 1000,
+        'min_ms': timings[0] * 1000,
+        'python_heap_peak_kib': peak / 1024
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the headline extraction engines on saved HN pages")
+    parser.add_argument('fixtures', nargs='*', help="HTML files to parse (defaults to benchmarks/fixtures/*.html)")
+    parser.add_argument('--limit', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    engines = [name for name in headline_engines if name != 'lxml' or LXML_AVAILABLE]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='headline-bench-') as workdir:
+        for fixture, html in load_fixtures(args.fixtures).items():
+            path = os.path.join(workdir, 'page.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            engine_results = {}
+            for name in engines:
+                engine_results[name] = bench_engine(headline_engines[name], html, args.limit, args.repeat)
+                engine_results[name]['peak_rss_kib'] = peak_rss_kib(name, path, args.limit)
+            results[fixture] = {'bytes': len(html.encode('utf-8')), 'engines': engine_results}
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
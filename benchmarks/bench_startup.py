@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('tweepy', 'PyPDF2', 'bs4', 'lxml', 'requests', 'apscheduler', 'watchdog')
+
+# Runs in a fresh interpreter per sample so import caches and threads do not carry over
+CHILD = """
+import sys, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+import metrics
+after_import = metrics.memory_usage()
+loaded = [name for name in {heavy!r} if name in sys.modules]
+main.create_app()
+started = time.perf_counter()
+after_services = metrics.memory_usage()
+main.stop_services()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'services_ms': (started - imported) * 1000,
+    'rss_after_import_kib': after_import.get('resident', 0) / 1024,
+    'rss_after_services_kib': after_services.get('resident', 0) / 1024,
+    'max_rss_kib': after_services.get('max_resident', 0) / 1024,
+    'modules_after_import': len(sys.modules),
+    'heavy_modules_after_import': loaded
+}}))
+"""
+
+def run_sample(workdir):
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR, LOG_FILE=os.path.join(workdir, 'bench.log'), SCHEDULER_MODE='local')
+    completed = subprocess.run(
+        [sys.executable, '-c', CHILD.format(heavy=HEAVY_MODULES)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure worker startup time and resident memory of main.py")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help="Write the JSON results to this file as well as stdout")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='agent-startup-')
+    try:
+        run_sample(workdir)
+        samples = [run_sample(workdir) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {'python': sys.version.split()[0], 'samples': len(samples)}
+    for key in ('import_ms', 'services_ms', 'rss_after_import_kib', 'rss_after_services_kib', 'max_rss_kib'):
+        values = sorted(sample[key] for sample in samples)
+        results[key] = {'mean': sum(values) / len(values), 'p50': values[len(values) // 2], 'min': values[0]}
+    results['modules_after_import'] = samples[-1]['modules_after_import']
+    results['heavy_modules_after_import'] = samples[-1]['heavy_modules_after_import']
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import html
+
+def hn_front_page(stories=30):
+    """Render a page with the same markup as the Hacker News front page."""
+    rows = []
+    for i in range(stories):
+        title = html.escape(f"Show HN: Example project number {i} & a longer title to match real story lengths")
+        rows.append(
+            f'<tr class="athing submission" id="{40000000 + i}">'
+            f'<td align="right" valign="top" class="title"><span class="rank">{i + 1}.</span></td>'
+            f'<td valign="top" class="votelinks"><center><a id="up_{40000000 + i}" href="vote?id={40000000 + i}&amp;how=up&amp;goto=news">'
+            f'<div class="votearrow" title="upvote"></div></a></center></td>'
+            f'<td class="title"><span class="titleline"><a href="https://example.com/posts/{i}">{title}</a>'
+            f'<span class="sitebit comhead"> (<a href="from?site=example.com"><span class="sitestr">example.com</span></a>)</span></span></td></tr>'
+            f'<tr><td colspan="2"></td><td class="subtext"><span class="subline">'
+            f'<span class="score" id="score_{40000000 + i}">{100 + i} points</span> by <a href="user?id=user{i}" class="hnuser">user{i}</a> '
+            f'<span class="age" title="2025-06-08T20:00:00"><a href="item?id={40000000 + i}">{i + 1} hours ago</a></span> '
+            f'<span id="unv_{40000000 + i}"></span> | <a href="hide?id={40000000 + i}&amp;goto=news">hide</a> | '
+            f'<a href="item?id={40000000 + i}">{i * 3}&nbsp;comments</a></span></td></tr>'
+            f'<tr class="spacer" style="height:5px"></tr>'
+        )
+    return (
+        '<html lang="en" op="news"><head><meta name="referrer" content="origin">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">'
+        '<link rel="stylesheet" type="text/css" href="news.css"><title>Hacker News</title></head><body>'
+        '<center><table id="hnmain" border="0" cellpadding="0" cellspacing="0" width="85%" bgcolor="#f6f6ef">'
+        '<tr><td bgcolor="#ff6600"><table border="0" cellpadding="0" cellspacing="0" width="100%" style="padding:2px">'
+        '<tr><td style="width:18px;padding-right:4px"><a href="https://news.ycombinator.com">'
+        '<img src="y18.svg" width="18" height="18" style="border:1px white solid; display:block"></a></td>'
+        '<td style="line-height:12pt; height:10px;"><span class="pagetop"><b class="hnname"><a href="news">Hacker News</a></b>'
+        '<a href="newest">new</a> | <a href="front">past</a> | <a href="newcomments">comments</a> | <a href="ask">ask</a> | '
+        '<a href="show">show</a> | <a href="jobs">jobs</a> | <a href="submit" rel="nofollow">submit</a></span></td></tr></table></td></tr>'
+        '<tr id="pagespace" title="" style="height:10px"></tr><tr><td><table border="0" cellpadding="0" cellspacing="0">'
+        + ''.join(rows) +
+        '<tr class="morespace" style="height:10px"></tr><tr><td colspan="2"></td>'
+        '<td class="title"><a href="?p=2" class="morelink" rel="next">More</a></td></tr></table></td></tr>'
+        '<tr><td><img src="s.gif" height="10" width="0"><table width="100%" cellspacing="0" cellpadding="1">'
+        '<tr><td bgcolor="#ff6600"></td></tr></table><br><center><span class="yclinks"><a href="newsguidelines.html">Guidelines</a> | '
+        '<a href="newsfaq.html">FAQ</a> | <a href="lists">Lists</a> | <a href="https://github.com/HackerNews/API">API</a> | '
+        '<a href="security.html">Security</a> | <a href="https://www.ycombinator.com/legal/">Legal</a> | '
+        '<a href="https://www.ycombinator.com/apply/">Apply to YC</a> | <a href="mailto:hn@ycombinator.com">Contact</a></span><br><br>'
+        '<form method="get" action="//hn.algolia.com/">Search: <input type="text" name="q" size="17" autocorrect="off" '
+        'spellcheck="false" autocapitalize="off" autocomplete="false"></form></center></td></tr></table></center>'
+        '<script type="text/javascript" src="hn.js"></script></body></html>'
+    )
+
+def make_pdf(pages=1, words_per_page=300, seed=0):
+    """Build a text PDF with the given number of pages; different seeds give different file contents."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>']
+    kids = ' '.join(f'{3 + 2 * i} 0 R' for i in range(pages))
+    objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>'.encode())
+    font = 3 + 2 * pages
+    for page in range(pages):
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 {font} 0 R >> >> /Contents {4 + 2 * page} 0 R >>'.encode()
+        )
+        lines = []
+        for line in range(0, words_per_page, 12):
+            words = ' '.join(f'doc{seed}page{page}word{word}' for word in range(line, min(line + 12, words_per_page)))
+            lines.append(f'({words}) Tj T*')
+        stream = f'BT /F1 9 Tf 11 TL 36 760 Td {" ".join(lines)} ET'.encode()
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return out
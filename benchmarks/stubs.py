@@ -0,0 +1,193 @@
+import os
+import ssl
+import json
+import shutil
+import tempfile
+import threading
+import subprocess
+import socketserver
+from email.utils import format_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fixtures import hn_front_page
+
+class _Server:
+    """Runs a socketserver on an ephemeral localhost port in a daemon thread."""
+
+    def __init__(self, server_class, handler):
+        self.server = server_class(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.port = self.server.server_address[1]
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class _HNHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.count()
+        if self.headers.get('If-None-Match') == stub.etag:
+            self.send_response(304)
+            self.send_header('ETag', stub.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', stub.etag)
+        self.send_header('Content-Length', str(len(stub.body)))
+        self.end_headers()
+        self.wfile.write(stub.body)
+
+    def log_message(self, format, *args):
+        pass
+
+class HNStub(_Server):
+    """Serves a generated Hacker News front page with an ETag so conditional GETs get 304s."""
+
+    def __init__(self, stories=30):
+        super().__init__(ThreadingHTTPServer, _HNHandler)
+        self.body = hn_front_page(stories).encode('utf-8')
+        self.etag = '"hn-fixture"'
+        self.url = f"http://127.0.0.1:{self.port}/"
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        stub = self.server.stub
+        self.reply('220 stub ESMTP ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip().split(' ', 1)[0].upper()
+            if command == 'EHLO':
+                self.reply('250-stub')
+                self.reply('250 8BITMIME')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                stub.count()
+                self.reply('250 OK: queued')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET and NOOP are accepted as-is
+                self.reply('250 OK')
+
+class SMTPStub(_Server):
+    """Accepts and discards mail without STARTTLS or AUTH; requests counts delivered messages."""
+
+    def __init__(self):
+        super().__init__(socketserver.ThreadingTCPServer, _SMTPHandler)
+        self.host = '127.0.0.1'
+
+def _tweet(tweet_id, screen_name):
+    created_at = datetime.fromtimestamp(1700000000 + tweet_id * 60, timezone.utc)
+    return {
+        'id': tweet_id,
+        'id_str': str(tweet_id),
+        'created_at': created_at.strftime('%a %b %d %H:%M:%S +0000 %Y'),
+        'full_text': f"Tweet {tweet_id} from {screen_name} about Tesla, SpaceX and AI",
+        'truncated': False,
+        'user': {'id': 1, 'id_str': '1', 'screen_name': screen_name, 'name': screen_name}
+    }
+
+class _TwitterHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        stub = self.server.stub
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Date', format_datetime(datetime.now(timezone.utc), usegmt=True))
+        self.send_header('x-rate-limit-limit', str(stub.rate_limit))
+        self.send_header('x-rate-limit-remaining', str(stub.remaining))
+        self.send_header('x-rate-limit-reset', str(stub.reset_at))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.count()
+        with stub._lock:
+            limited = stub.remaining == 0
+            stub.remaining = max(stub.remaining - 1, 0)
+        if limited:
+            self.send_json(429, {'errors': [{'code': 88, 'message': 'Rate limit exceeded'}]})
+            return
+        url = urlparse(self.path)
+        if url.path != '/1.1/statuses/user_timeline.json':
+            self.send_json(404, {'errors': [{'code': 34, 'message': 'Sorry, that page does not exist.'}]})
+            return
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        screen_name = params.get('screen_name', 'user')
+        count = int(params.get('count', 20))
+        since_id = int(params.get('since_id', 0))
+        stub.since_ids.append(since_id or None)
+        newest = stub.latest_id
+        tweets = [_tweet(tweet_id, screen_name) for tweet_id in range(newest, max(since_id, newest - count), -1)]
+        self.send_json(200, tweets)
+
+    def log_message(self, format, *args):
+        pass
+
+class TwitterStub(_Server):
+    """HTTPS stand-in for the v1.1 user_timeline endpoint with since_id support and a rate limit.
+
+    Every timeline request uses one of rate_limit calls and gets 429 once they run out;
+    raise latest_id to publish new tweets. since_ids records the since_id of each request.
+
+    tweepy only speaks HTTPS, so this needs the openssl binary to create a self-signed
+    certificate; point REQUESTS_CA_BUNDLE at cert_path and TWITTER_API_HOST at host.
+    """
+
+    def __init__(self, latest_id=1000, rate_limit=100000):
+        super().__init__(ThreadingHTTPServer, _TwitterHandler)
+        self.latest_id = latest_id
+        self.rate_limit = self.remaining = rate_limit
+        self.reset_at = int(datetime.now(timezone.utc).timestamp()) + 900
+        self.since_ids = []
+        self.host = f"127.0.0.1:{self.port}"
+        self._cert_dir = tempfile.mkdtemp(prefix='twitter-stub-')
+        self.cert_path = os.path.join(self._cert_dir, 'cert.pem')
+        key_path = os.path.join(self._cert_dir, 'key.pem')
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=127.0.0.1',
+             '-addext', 'subjectAltName=IP:127.0.0.1', '-keyout', key_path, '-out', self.cert_path],
+            check=True, capture_output=True
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cert_path, key_path)
+        self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+
+    @staticmethod
+    def available():
+        return shutil.which('openssl') is not None
+
+    def stop(self):
+        super().stop()
+        shutil.rmtree(self._cert_dir, ignore_errors=True)
@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from file_lock import LeaderLock
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+def hash_stream(stream, chunk_size=CHUNK_SIZE):
+    digest = hashlib.md5()
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_file(file_path, chunk_size=CHUNK_SIZE):
+    with open(file_path, 'rb') as f:
+        return hash_stream(f, chunk_size)
+
+class FileIndex:
+    """Persistent digest -> path index for the files stored in a folder.
+
+    Rows remember the size and mtime a file had when it was hashed, so a
+    resync only rehashes files that were added or changed since. With a lock_path,
+    workers sharing the index skip the sync while another one is running it.
+    """
+
+    def __init__(self, folder, db_path=None, lock_path=None):
+        self.folder = folder
+        self.db_path = db_path or f"{folder.rstrip(os.sep)}_index.db"
+        self._sync_lock = LeaderLock(lock_path) if lock_path else None
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, digest TEXT NOT NULL, size INTEGER NOT NULL, mtime REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS files_digest ON files (digest)")
+        conn.commit()
+
+    def _conn(self):
+        # A connection inherited from the parent of a forked worker must not be reused
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db_pid = os.getpid()
+        return self._db
+
+    def sync(self):
+        """Index files added or changed since the last sync; returns False if another process is syncing."""
+        if self._sync_lock and not self._sync_lock.acquire():
+            logger.info(f"Upload index for {self.folder} is being synced by another process, skipping")
+            return False
+        try:
+            self._sync()
+        finally:
+            if self._sync_lock:
+                self._sync_lock.release()
+        return True
+
+    def _sync(self):
+        with self._lock:
+            known = {row[0]: (row[1], row[2]) for row in self._conn().execute("SELECT path, size, mtime FROM files")}
+        seen = set()
+        hashed = 0
+        for entry in os.scandir(self.folder):
+            if not entry.is_file() or entry.name.startswith('.'):
+                continue
+            path = os.path.join(self.folder, entry.name)
+            seen.add(path)
+            stat = entry.stat()
+            if known.get(path) == (stat.st_size, stat.st_mtime):
+                continue
+            try:
+                self.add(path, hash_file(path), stat)
+                hashed += 1
+            except OSError as e:
+                logger.error(f"Error indexing {path}: {str(e)}")
+        removed = [path for path in known if path not in seen]
+        with self._lock:
+            self._conn().executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+            self._conn().commit()
+        logger.info(f"Upload index synced: {len(seen)} files, {hashed} hashed, {len(removed)} removed")
+
+    def add(self, path, digest, stat=None):
+        stat = stat or os.stat(path)
+        with self._lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO files (path, digest, size, mtime) VALUES (?, ?, ?, ?)",
+                (path, digest, stat.st_size, stat.st_mtime)
+            )
+            self._conn().commit()
+
+    def lookup(self, digest):
+        with self._lock:
+            rows = self._conn().execute("SELECT path FROM files WHERE digest = ?", (digest,)).fetchall()
+        for (path,) in rows:
+            if os.path.isfile(path):
+                return path
+            with self._lock:
+                self._conn().execute("DELETE FROM files WHERE path = ?", (path,))
+                self._conn().commit()
+        return None
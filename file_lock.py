@@ -0,0 +1,50 @@
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+FLOCK_AVAILABLE = fcntl is not None
+
+def lock_file(f):
+    """Block until f holds an exclusive flock; returns False where flock is unavailable."""
+    if fcntl is None:
+        return False
+    fcntl.flock(f, fcntl.LOCK_EX)
+    return True
+
+class LeaderLock:
+    """Non-blocking exclusive lock on a file, held by one process at a time across workers.
+
+    acquire() returns True once this process holds the lock and keeps it until release()
+    or exit. Where flock is unavailable every process gets it, so each runs the guarded
+    work itself.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._pid = None
+
+    def acquire(self):
+        if self._file is not None and self._pid != os.getpid():
+            # A forked child shares the parent's lock, so it lets go of its copy and competes afresh
+            self._file.close()
+            self._file = None
+        if self._file is not None or fcntl is None:
+            return True
+        f = open(self.path, 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        self._pid = os.getpid()
+        return True
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
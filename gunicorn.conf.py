@@ -0,0 +1,23 @@
+# Gunicorn reads this file when started from the project directory (or with -c gunicorn.conf.py).
+# Importing main starts no background threads except the log listener, so each worker starts the
+# scheduler, PDF ingestion and the upload index sync itself as soon as it boots: saved interval
+# agents run after a restart with no traffic, and no request waits for them. This also holds
+# with --preload, since the hooks run in the workers, never in the master.
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def on_starting(server):
+    # Snapshots of a previous run's workers would otherwise be added to this run's totals
+    import metrics
+    metrics.clear_snapshots(os.getenv('METRICS_DIR'))
+
+def post_worker_init(worker):
+    import main
+    main.start_services()
+
+def worker_exit(server, worker):
+    import main
+    main.stop_services()
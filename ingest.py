@@ -0,0 +1,200 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from tools import summarize_pdf
+from log_config import child_log_queue, configure_child_logging
+from file_lock import LeaderLock
+
+logger = logging.getLogger(__name__)
+
+def wait_until_ready(file_path, timeout=30, poll_interval=0.1, stable_polls=2):
+    """Wait until the file has stopped growing and ends with a PDF trailer."""
+    deadline = time.monotonic() + timeout
+    last_size = -1
+    stable = 0
+    while time.monotonic() < deadline:
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = -1
+        if size > 0 and size == last_size:
+            stable += 1
+            if stable >= stable_polls and _has_pdf_trailer(file_path):
+                return True
+        else:
+            stable = 0
+        last_size = size
+        time.sleep(poll_interval)
+    return False
+
+def _has_pdf_trailer(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            f.seek(max(0, os.path.getsize(file_path) - 1024))
+            return b'%%EOF' in f.read()
+    except OSError:
+        return False
+
+def _summarize(file_path, ready_timeout):
+    # Runs in a pool process, so it must stay a top-level function. Waiting here rather than
+    # in the dispatcher lets a file that is still being written hold up only its own worker
+    if not wait_until_ready(file_path, ready_timeout):
+        raise TimeoutError(f"PDF was not complete after {ready_timeout}s, skipping")
+    result = summarize_pdf(file_path)
+    if result.get('error'):
+        raise RuntimeError(result['output'])
+    return result['output']
+
+class PDFHandler(FileSystemEventHandler):
+    def __init__(self, ingest_queue):
+        self.ingest_queue = ingest_queue
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.ingest_queue.submit(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.ingest_queue.submit(event.dest_path)
+
+class PDFIngestQueue:
+    """Single watcher for a folder that parses each new PDF once and fans the result out to subscribers.
+
+    With a lock_path, only the process holding the lock file watches and parses, so
+    several workers sharing the folder do not each parse every upload. The others
+    retry the lock every lock_retry seconds and take over if the holder exits.
+    """
+
+    def __init__(self, folder, workers=None, queue_size=100, ready_timeout=30, lock_path=None, lock_retry=30):
+        self.folder = folder
+        self.workers = workers or os.cpu_count() or 1
+        self.ready_timeout = ready_timeout
+        self.lock_path = lock_path
+        self.lock_retry = lock_retry
+        self._queue = queue.Queue(maxsize=queue_size)
+        # Bounds the parses handed to the pool so the queue, not the pool, absorbs bursts
+        self._in_flight = threading.BoundedSemaphore(self.workers * 2)
+        self._pending = set()
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._observer = None
+        self._pool = None
+        self._dispatcher = None
+        self._started = False
+        self._leader = LeaderLock(lock_path) if lock_path else None
+        self._standby = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._stopping.clear()
+        if self._acquire():
+            self._watch()
+            return
+        logger.info(f"PDF ingestion for {self.folder} runs in another process, standing by")
+        self._standby = threading.Thread(target=self._wait_for_lock, name='pdf-ingest-standby', daemon=True)
+        self._standby.start()
+
+    def _acquire(self):
+        return self._leader is None or self._leader.acquire()
+
+    def _wait_for_lock(self):
+        while not self._stopping.wait(self.lock_retry):
+            if self._acquire():
+                self._watch()
+                return
+
+    def _watch(self):
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            # Pool processes hand their records to this process rather than writing the log file
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=configure_child_logging, initargs=(child_log_queue(),))
+            self._dispatcher = threading.Thread(target=self._dispatch, name='pdf-ingest', daemon=True)
+            self._dispatcher.start()
+            self._observer = Observer()
+            self._observer.schedule(PDFHandler(self), self.folder, recursive=False)
+            self._observer.start()
+        logger.info(f"Started PDF ingestion for {self.folder} with {self.workers} workers")
+
+    def stop(self):
+        self._stopping.set()
+        with self._lock:
+            observer, self._observer = self._observer, None
+            standby, self._standby = self._standby, None
+            self._started = False
+        if standby:
+            standby.join()
+        if observer:
+            observer.stop()
+            observer.join()
+            self._queue.put(None)
+            self._dispatcher.join()
+            self._pool.shutdown(wait=True)
+            logger.info(f"Stopped PDF ingestion for {self.folder}")
+        if self._leader:
+            self._leader.release()
+
+    def subscribe(self, subscriber_id, callback):
+        with self._lock:
+            self._subscribers[subscriber_id] = callback
+        self.start()
+
+    def unsubscribe(self, subscriber_id):
+        with self._lock:
+            self._subscribers.pop(subscriber_id, None)
+
+    def submit(self, file_path):
+        if not file_path.lower().endswith('.pdf'):
+            return
+        with self._lock:
+            if file_path in self._pending:
+                return
+            self._pending.add(file_path)
+        logger.info(f"New PDF detected: {file_path}")
+        # Blocks the watcher thread when the queue is full, which is the backpressure
+        self._queue.put(file_path)
+
+    def _dispatch(self):
+        while True:
+            file_path = self._queue.get()
+            if file_path is None:
+                return
+            self._in_flight.acquire()
+            try:
+                future = self._pool.submit(_summarize, file_path, self.ready_timeout)
+            except Exception as e:
+                logger.error(f"Error queueing PDF {file_path}: {str(e)}")
+                self._in_flight.release()
+                self._done(file_path)
+                continue
+            future.add_done_callback(lambda future, file_path=file_path: self._publish(file_path, future))
+
+    def _publish(self, file_path, future):
+        self._in_flight.release()
+        self._done(file_path)
+        try:
+            output = future.result()
+        except Exception as e:
+            logger.error(f"Error processing PDF {file_path}: {str(e)}")
+            return
+        logger.info(f"PDF summarization result for {file_path}: {output}")
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for subscriber_id, callback in subscribers:
+            try:
+                callback(file_path, output)
+            except Exception as e:
+                logger.error(f"Error delivering PDF summary to {subscriber_id}: {str(e)}")
+
+    def _done(self, file_path):
+        with self._lock:
+            self._pending.discard(file_path)
@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = 'job_id, status, result, error, created_at, finished_at, info'
+
+class JobManager:
+    """Runs agent invocations on a thread pool and keeps their status for polling.
+
+    A job runs in the worker that accepted it, but its status is stored in SQLite so a
+    poll or stream that reaches any other worker sees it too; waiting on a job owned by
+    another worker re-reads the database every poll_interval seconds.
+    """
+
+    def __init__(self, workers=8, ttl=3600, db_path='jobs.db', poll_interval=0.2):
+        self.ttl = ttl
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='agent-job')
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, finished_at REAL, info TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at)")
+        conn.commit()
+
+    def _conn(self):
+        # Same rules as the agent registry: one connection per thread and per forked worker
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.pid = os.getpid()
+        return conn
+
+    def submit(self, fn, *args, **info):
+        job_id = str(uuid.uuid4())
+        conn = self._conn()
+        conn.execute("DELETE FROM jobs WHERE finished_at < ?", (time.time() - self.ttl,))
+        conn.execute(
+            f"INSERT INTO jobs ({_COLUMNS}) VALUES (?, 'pending', NULL, NULL, ?, NULL, ?)",
+            (job_id, time.time(), json.dumps(info, default=str))
+        )
+        conn.commit()
+        self._executor.submit(self._run, job_id, fn, args)
+        logger.info(f"Job {job_id} submitted")
+        return job_id
+
+    def _run(self, job_id, fn, args):
+        self._update(job_id, status='running')
+        try:
+            result = fn(*args)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self._update(job_id, status='error', error=str(e), finished_at=time.time())
+            return
+        self._update(job_id, status='done', result=json.dumps(result, default=str), finished_at=time.time())
+        logger.info(f"Job {job_id} finished")
+
+    def _update(self, job_id, **fields):
+        conn = self._conn()
+        conn.execute(
+            f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE job_id = ?",
+            list(fields.values()) + [job_id]
+        )
+        conn.commit()
+        with self._cond:
+            self._cond.notify_all()
+
+    def get(self, job_id):
+        row = self._conn().execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+        job_id, status, result, error, created_at, finished_at, info = row
+        return dict(json.loads(info), job_id=job_id, status=status, result=json.loads(result) if result else None,
+                    error=error, created_at=created_at, finished_at=finished_at)
+
+    def wait(self, job_id, timeout):
+        """Block until the job finishes or the timeout passes, then return its current state."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if not job or job['finished_at'] or remaining <= 0:
+                return job
+            # Jobs of this worker wake waiters as soon as they finish; others are polled
+            with self._cond:
+                self._cond.wait(min(remaining, self.poll_interval))
@@ -0,0 +1,200 @@
+import os
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, WatchedFileHandler
+from dotenv import load_dotenv
+from file_lock import lock_file
+
+load_dotenv()
+
+LOG_FILE = os.getenv('LOG_FILE', 'agent_builder.log')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_ROTATION = os.getenv('LOG_ROTATION', 'size')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_MAX_MESSAGE_CHARS = int(os.getenv('LOG_MAX_MESSAGE_CHARS', 2000))
+LOG_BULKY_CHARS = int(os.getenv('LOG_BULKY_CHARS', 500))
+LOG_BULKY_SAMPLE_RATE = float(os.getenv('LOG_BULKY_SAMPLE_RATE', 0.1))
+
+_lock = threading.Lock()
+_listener = None
+_configured_pid = None
+_child_records = None
+_child_pid = None
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class BulkySampler(logging.Filter):
+    """Keeps only a sample of long INFO/DEBUG records such as headline lists and PDF summaries."""
+
+    def __init__(self, threshold, rate):
+        super().__init__()
+        self.threshold = threshold
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or len(record.getMessage()) <= self.threshold:
+            return True
+        return random.random() < self.rate
+
+class TruncatingQueueHandler(QueueHandler):
+    """Hands records to the listener thread without blocking; records are dropped if the queue is full."""
+
+    def __init__(self, log_queue, max_chars):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        if len(record.msg) > self.max_chars:
+            record.msg = f"{record.msg[:self.max_chars]}... [truncated {len(record.msg) - self.max_chars} chars]"
+            record.message = record.msg
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _ChildRecords(QueueListener):
+    """Writes records that child processes put on a multiprocessing queue through this process's listener."""
+
+    def handle(self, record):
+        listener = _listener
+        if listener:
+            listener.handle(record)
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """Size-rotated log file that several processes append to.
+
+    Every process follows the file to its new inode once another one rotated it, as
+    WatchedFileHandler does, and rollovers are serialized through lock_path so a process
+    that finds the file already rotated does not rename it a second time.
+    """
+
+    def __init__(self, filename, maxBytes, backupCount, lock_path, encoding=None):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self.lock_path = lock_path
+
+    def _reopen_if_rotated(self):
+        if self.stream is None:
+            return False
+        try:
+            current = os.path.samestat(os.stat(self.baseFilename), os.fstat(self.stream.fileno()))
+        except FileNotFoundError:
+            current = False
+        if current:
+            return False
+        self.stream.close()
+        self.stream = self._open()
+        return True
+
+    def shouldRollover(self, record):
+        self._reopen_if_rotated()
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        with open(self.lock_path, 'a') as lock:
+            lock_file(lock)
+            if not self._reopen_if_rotated():
+                super().doRollover()
+
+def _file_handler():
+    # {pid} in LOG_FILE gives each process its own file. A shared file is rotated by whichever
+    # process crosses LOG_MAX_BYTES first and followed by the rest, or left to logrotate with
+    # LOG_ROTATION=external
+    path = LOG_FILE.replace('{pid}', str(os.getpid()))
+    if LOG_ROTATION == 'external':
+        return WatchedFileHandler(path, encoding='utf-8')
+    if '{pid}' in LOG_FILE:
+        return RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    return SharedRotatingFileHandler(path, LOG_MAX_BYTES, LOG_BACKUP_COUNT, f"{path}.lock", encoding='utf-8')
+
+def _queue_handler(log_queue):
+    queue_handler = TruncatingQueueHandler(log_queue, LOG_MAX_MESSAGE_CHARS)
+    queue_handler.addFilter(BulkySampler(LOG_BULKY_CHARS, LOG_BULKY_SAMPLE_RATE))
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+def configure_logging(force=False):
+    """Route all loggers through a queue to a log file written by a background thread.
+
+    Safe to call repeatedly; it reconfigures only when forced or after a fork, since
+    the listener thread does not survive into child processes.
+    """
+    global _listener, _configured_pid
+    with _lock:
+        if _configured_pid == os.getpid() and not force:
+            return
+        if _listener and _configured_pid == os.getpid():
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+
+        file_handler = _file_handler()
+        if LOG_FORMAT == 'json':
+            file_handler.setFormatter(JSONFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _queue_handler(log_queue)
+        _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        _configured_pid = os.getpid()
+
+def child_log_queue():
+    """Return the queue child processes log through; pass it to configure_child_logging in each child."""
+    global _child_records, _child_pid
+    with _lock:
+        if _child_pid != os.getpid():
+            _child_records = _ChildRecords(multiprocessing.Queue(LOG_QUEUE_SIZE))
+            _child_records.start()
+            _child_pid = os.getpid()
+        return _child_records.queue
+
+def configure_child_logging(log_queue):
+    """Pool initializer: send this process's records to its parent's log file instead of opening it.
+
+    Runs in a freshly started child, where _lock may still be held by a thread of the parent.
+    """
+    global _listener, _configured_pid
+    _listener = None
+    _configured_pid = os.getpid()
+    _queue_handler(log_queue)
+
+def _stop_listener():
+    global _child_records, _listener
+    with _lock:
+        if _child_records and _child_pid == os.getpid():
+            _child_records.stop()
+            _child_records = None
+        if _listener and _configured_pid == os.getpid():
+            _listener.stop()
+            _listener = None
+
+atexit.register(_stop_listener)
@@ -0,0 +1,155 @@
+import time
+import queue
+import logging
+import smtplib
+import threading
+
+logger = logging.getLogger(__name__)
+
+class SMTPPool:
+    """Thread-safe pool of logged-in SMTP sessions, checked with NOOP after sitting idle."""
+
+    def __init__(self, host, port, username=None, password=None, size=4, starttls=True, noop_after=10, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.noop_after = noop_after
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            server.starttls()
+        server.ehlo()
+        if self.username and server.has_extn('auth'):
+            server.login(self.username, self.password)
+        logger.info(f"Opened SMTP connection to {self.host}:{self.port}")
+        return server
+
+    def _healthy(self, server, last_used):
+        if time.monotonic() - last_used < self.noop_after:
+            return True
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _close(self, server):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def acquire(self):
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    server, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if self._healthy(server, last_used):
+                    return server
+                self._close(server)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, server, broken=False):
+        if broken:
+            self._close(server)
+        else:
+            self._idle.put((server, time.monotonic()))
+        self._slots.release()
+
+    def send_batch(self, messages):
+        """Send messages over one session; returns a list of None (sent) or an error string per message."""
+        results = []
+        server = self.acquire()
+        # Anything but a clean finish leaves the session in an unknown state, so it is closed
+        broken = True
+        reconnected = False
+        index = 0
+        try:
+            while index < len(messages):
+                try:
+                    server.send_message(messages[index])
+                    results.append(None)
+                except smtplib.SMTPServerDisconnected as e:
+                    # The session dropped mid-batch: reconnect once and retry the same message
+                    if reconnected:
+                        return results + [str(e)] * (len(messages) - index)
+                    self._close(server)
+                    server = None
+                    try:
+                        server = self._connect()
+                    except (smtplib.SMTPException, OSError) as connect_error:
+                        return results + [str(connect_error)] * (len(messages) - index)
+                    reconnected = True
+                    continue
+                except (smtplib.SMTPException, OSError) as e:
+                    results.append(str(e))
+                index += 1
+            broken = False
+            return results
+        finally:
+            if server is None:
+                self._slots.release()
+            else:
+                self.release(server, broken=broken)
+
+    def close(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+class Outbox:
+    """Queue of outgoing messages drained in batches by a background thread."""
+
+    def __init__(self, pool, batch_size=20, max_queue=1000):
+        self.pool = pool
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._drain, name='smtp-outbox', daemon=True)
+        self._worker.start()
+
+    def put(self, message):
+        self._queue.put(message)
+
+    def flush(self, timeout=None):
+        """Wait until every queued message was handed to the server; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _drain(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                results = self.pool.send_batch(batch)
+            except Exception as e:
+                results = [str(e)] * len(batch)
+            for message, error in zip(batch, results):
+                if error:
+                    logger.error(f"Error sending email to {message['To']}: {error}")
+                else:
+                    logger.info(f"Email sent to {message['To']} with subject '{message['Subject']}'")
+            for _ in batch:
+                self._queue.task_done()
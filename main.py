@@ -1,23 +1,46 @@
-from flask import Flask, request, jsonify, send_from_directory
+import time
+_import_started = time.perf_counter()
+from flask import Flask, Request, Response, g, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
+import json
+import math
 import uuid
 import logging
-import time
-import hashlib
+import threading
 from dotenv import load_dotenv
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from log_config import configure_logging
 from agents import create_agent
-from tools import available_tools
+from tools import available_tools, flush_outboxes
+from file_index import FileIndex
+from jobs import JobManager
+from registry import AgentRecord, AgentRegistry
+from uploads import ChunkedUploads, HashingFile, UploadTooLarge, copy_stream
+import metrics
 
 load_dotenv()
-logging.basicConfig(filename='agent_builder.log', level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+configure_logging()
 logger = logging.getLogger(__name__)
 
+UPLOAD_FOLDER = 'uploads'
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', 200 * 1024 * 1024))
+# Multipart boundaries and headers come on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+class UploadRequest(Request):
+    """Streams PDF parts of /upload_pdf straight into hashed temp files in the upload folder."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.path == '/upload_pdf' and filename and filename.lower().endswith('.pdf'):
+            stream = HashingFile(UPLOAD_FOLDER, MAX_UPLOAD_BYTES)
+            self.__dict__.setdefault('upload_files', []).append(stream)
+            return stream
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD
 CORS(app, resources={r"/*": {"origins": "*", "methods": ["GET", "POST", "OPTIONS"], "allow_headers": ["Content-Type"]}})
 
 @app.route('/<path:path>', methods=['OPTIONS'])
@@ -28,46 +51,172 @@ def handle_options(path):
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
     return response
 
-scheduler = BackgroundScheduler()
-scheduler.start()
-logger.info("APScheduler started successfully")
+AGENT_DB = os.getenv('AGENT_DB', 'agents.db')
+
+# Job state lives in the agent database so every worker can answer polls for any job
+jobs = JobManager(workers=int(os.getenv('JOB_WORKERS', 8)), ttl=int(os.getenv('JOB_TTL_SECONDS', 3600)), db_path=AGENT_DB)
+JOB_MAX_WAIT = 30
+
+agents = AgentRegistry(
+    AGENT_DB,
+    lambda prompt: create_agent(available_tools, prompt),
+    executor_cache_size=int(os.getenv('AGENT_EXECUTOR_CACHE_SIZE', 1024))
+)
+LIST_AGENTS_MAX_LIMIT = 1000
 
-agents = {}
-UPLOAD_FOLDER = 'uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+upload_index = FileIndex(UPLOAD_FOLDER, lock_path=os.getenv('UPLOAD_INDEX_LOCK_FILE', 'upload_index.lock'))
+chunked_uploads = ChunkedUploads(UPLOAD_FOLDER, MAX_UPLOAD_BYTES, ttl=int(os.getenv('CHUNKED_UPLOAD_TTL_SECONDS', 24 * 3600)))
+
+# Background services are started per worker by start_services(), not at import time
+scheduler = None
+pdf_ingest = None
+_services_pid = None
+_services_lock = threading.Lock()
+
+def store_pdf_summary(file_path, output):
+    # Every PDF agent summarizes new uploads the same way, so one update covers all of them
+    updated = agents.set_pdf_summary("pdf_summarization", output)
+    logger.info(f"Stored PDF summary for {file_path} on {updated} agents")
+
+def start_services():
+    """Sync the upload index and start PDF ingestion and the scheduler in this process.
+
+    Runs once per process: from create_app(), from the gunicorn worker hook in
+    gunicorn.conf.py, or on the first request when another server imports main:app.
+    Threads do not survive a fork, so a worker forked from a process that had already
+    started them starts its own.
+    """
+    global scheduler, pdf_ingest, _services_pid
+    with _services_lock:
+        if _services_pid == os.getpid():
+            return
+        start = time.perf_counter()
+        # A no-op unless this is a forked worker that needs its own log listener
+        configure_logging()
+        from ingest import PDFIngestQueue
+        from scheduling import AgentScheduler
+
+        # Hashing a large archive takes a while, so it runs beside the other services, in one worker at a time
+        threading.Thread(target=upload_index.sync, name='upload-index-sync', daemon=True).start()
+        pdf_ingest = PDFIngestQueue(
+            UPLOAD_FOLDER,
+            workers=int(os.getenv('PDF_INGEST_WORKERS', 0)) or None,
+            queue_size=int(os.getenv('PDF_INGEST_QUEUE_SIZE', 100)),
+            lock_path=os.getenv('PDF_INGEST_LOCK_FILE', 'pdf_ingest.lock'),
+            lock_retry=int(os.getenv('SCHEDULER_SYNC_SECONDS', 30))
+        )
+        if agents.has_type("pdf_summarization"):
+            pdf_ingest.subscribe("agents", store_pdf_summary)
+
+        agent_scheduler = AgentScheduler(
+            lambda agent_id: run_agent(agent_id),
+            agents,
+            mode=os.getenv('SCHEDULER_MODE', 'shared'),
+            lock_path=os.getenv('SCHEDULER_LOCK_FILE', 'scheduler.lock'),
+            max_workers=int(os.getenv('SCHEDULER_MAX_WORKERS', 10)),
+            jitter=float(os.getenv('SCHEDULER_JITTER', 0.1)),
+            misfire_grace_time=int(os.getenv('SCHEDULER_MISFIRE_GRACE_SECONDS', 60)),
+            sync_interval=int(os.getenv('SCHEDULER_SYNC_SECONDS', 30))
+        )
+        agent_scheduler.start()
+        scheduler = agent_scheduler
+        metrics.start_snapshots(os.getenv('METRICS_DIR'), float(os.getenv('METRICS_SNAPSHOT_SECONDS', 5)))
+        _services_pid = os.getpid()
+        metrics.record_startup('services', time.perf_counter() - start)
+        logger.info(f"Background services started in process {os.getpid()}")
+
+def stop_services():
+    global scheduler, pdf_ingest, _services_pid
+    with _services_lock:
+        if _services_pid != os.getpid():
+            return
+        pdf_ingest.stop()
+        scheduler.shutdown()
+        flush_outboxes()
+        metrics.stop_snapshots()
+        scheduler = pdf_ingest = _services_pid = None
+
+def create_app():
+    """App factory for servers and tests: returns the app with its background services running."""
+    start_services()
+    return app
 
 @app.errorhandler(405)
 def method_not_allowed(e):
     logger.error(f"405 Method Not Allowed: {request.method} on {request.path}")
     return jsonify({'error': f"Method {request.method} not allowed on {request.path}. Use POST."}), 405
 
+@app.errorhandler(413)
+@app.errorhandler(UploadTooLarge)
+def upload_too_large(e):
+    logger.error(f"Upload to {request.path} exceeds the {MAX_UPLOAD_BYTES} byte limit")
+    return jsonify({'error': f"File exceeds the maximum upload size of {MAX_UPLOAD_BYTES} bytes"}), 413
+
+@app.teardown_request
+def discard_upload_files(exc):
+    # Temp files of rejected, duplicate or failed uploads; committed ones were already renamed
+    for stream in request.__dict__.get('upload_files', ()):
+        stream.discard()
+
 @app.after_request
 def log_response_headers(response):
     if request.method == "OPTIONS":
-        logger.info(f"OPTIONS response headers: {response.headers}")
+        logger.debug(f"OPTIONS response headers: {response.headers}")
     return response
 
-class PDFHandler(FileSystemEventHandler):
-    def __init__(self, agent_id):
-        self.agent_id = agent_id
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    # Only servers that load main:app without a worker boot hook get here with services stopped
+    if _services_pid != os.getpid():
+        start_services()
 
-    def on_created(self, event):
-        if event.is_directory or not event.src_path.lower().endswith('.pdf'):
-            return
-        logger.info(f"New PDF detected: {event.src_path}")
-        try:
-            time.sleep(1)
-            agent_data = agents.get(self.agent_id)
-            if not agent_data:
-                logger.error(f"Agent {self.agent_id} not found for PDF processing")
-                return
-            agent = agent_data['agent']
-            prompt = f"Summarize the PDF at {event.src_path}"
-            output = agent.invoke({'input': prompt})['output']
-            logger.info(f"PDF summarization result for {event.src_path}: {output}")
-            agent_data['last_pdf_summary'] = output
-        except Exception as e:
-            logger.error(f"Error processing PDF {event.src_path}: {str(e)}")
+@app.after_request
+def record_request_metrics(response):
+    start = g.get('request_start')
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint, request.method, response.status_code)
+    return response
+
+def is_truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def parse_interval(value):
+    """Return a schedule interval in minutes, or None if none was given.
+
+    Accepts positive numbers and numeric strings; raises ValueError for anything else.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Invalid interval value: {value}")
+    minutes = float(value)
+    if not math.isfinite(minutes) or minutes <= 0:
+        raise ValueError(f"Invalid interval value: {value}")
+    return minutes
+
+def initial_run(agent_id):
+    record = agents.get(agent_id)
+    logger.info(f"Invoking agent for initial run: {agent_id}")
+    output = agents.executor(record).invoke({'input': record.prompt})['output']
+    logger.info(f"Initial run for agent {agent_id} successful: {output}")
+    return {'agent_id': agent_id, 'output': output}
+
+def manual_run(agent_id):
+    record = agents.get(agent_id)
+    prompt = record.prompt
+    logger.info(f"Manually running agent {agent_id} with prompt: {prompt}")
+    output = agents.executor(record).invoke({'input': prompt})['output']
+    if record.last_pdf_summary:
+        output += f"\nLast PDF Summary: {record.last_pdf_summary}"
+    logger.info(f"Manual run for agent {agent_id} successful: {output}")
+    return {'agent_id': agent_id, 'output': output}
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
@@ -76,16 +225,21 @@ def index():
 @app.route('/list_agents', methods=['GET'])
 def list_agents():
     try:
-        agent_details = []
-        for agent_id, agent_data in agents.items():
-            agent_details.append({
-                'agent_id': agent_id,
-                'prompt': agent_data['prompt'],
-                'interval': agent_data['interval'],
-                'last_pdf_summary': agent_data['last_pdf_summary']
-            })
-        logger.info("Returning list of agents")
-        return jsonify({'agents': agent_details})
+        try:
+            limit = min(int(request.args.get('limit', 100)), LIST_AGENTS_MAX_LIMIT)
+            cursor = int(request.args.get('cursor', 0))
+        except ValueError:
+            logger.error(f"Invalid pagination parameters: {dict(request.args)}")
+            return jsonify({'error': 'limit and cursor must be integers'}), 400
+        records, next_cursor = agents.list(
+            limit=max(limit, 1),
+            cursor=cursor,
+            agent_type=request.args.get('type'),
+            query=request.args.get('q'),
+            agent_id=request.args.get('agent_id')
+        )
+        logger.info(f"Returning list of {len(records)} agents")
+        return jsonify({'agents': [record.to_dict() for record in records], 'next_cursor': next_cursor})
     except Exception as e:
         logger.error(f"Error listing agents: {str(e)}")
         return jsonify({'error': f"Error listing agents: {str(e)}"}), 500
@@ -103,59 +257,55 @@ def generate_agent():
             logger.error("Prompt is required but was not provided")
             return jsonify({'error': 'Prompt is required'}), 400
 
+        interval = data.get('interval', None)
+        try:
+            interval_minutes = parse_interval(interval)
+        except ValueError:
+            logger.error(f"Invalid interval value '{interval}'")
+            return jsonify({'error': f"Invalid interval value: {interval}"}), 400
+
         logger.info(f"Generating agent for prompt: {prompt}")
         agent = create_agent(available_tools, prompt)
         logger.info(f"Agent created successfully for prompt: {prompt}")
         agent_id = str(uuid.uuid4())
         
-        agents[agent_id] = {
-            'agent': agent,
-            'prompt': prompt,
-            'interval': data.get('interval', None),
-            'last_pdf_summary': None
-        }
+        # Saved only once the request is valid, since the scheduler picks up every saved interval
+        stored_interval = str(interval).strip() if interval_minutes is not None else None
+        agents.add(AgentRecord(agent_id, prompt, stored_interval, agent.agent_type), executor=agent)
 
         output = None
-        if not ("summarize the pdf" in prompt.lower() or "summarize pdf" in prompt.lower()):
+        job_id = None
+        timing = None
+        if agent.agent_type != "pdf_summarization":
             try:
-                logger.info(f"Invoking agent for initial run: {agent_id}")
-                output = agent.invoke({'input': prompt})['output']
-                logger.info(f"Initial run for agent {agent_id} successful: {output}")
+                if is_truthy(data.get('async', False)):
+                    job_id = jobs.submit(initial_run, agent_id, agent_id=agent_id)
+                else:
+                    with metrics.track_timing() as timing:
+                        output = initial_run(agent_id)['output']
             except Exception as e:
                 logger.error(f"Error running agent {agent_id}: {str(e)}")
                 return jsonify({'error': f"Error running agent: {str(e)}"}), 500
         else:
             output = "Agent created for PDF summarization. Please upload a PDF to proceed."
 
-        interval = agents[agent_id]['interval']
-        if interval and interval.strip():
-            try:
-                interval_minutes = float(interval)
-                scheduler.add_job(
-                    run_agent,
-                    trigger=IntervalTrigger(minutes=interval_minutes),
-                    args=[agent_id],
-                    id=agent_id,
-                    max_instances=1,
-                    replace_existing=True
-                )
-                logger.info(f"Agent {agent_id} scheduled to run every {interval_minutes} minutes")
-            except ValueError as e:
-                logger.error(f"Invalid interval value '{interval}': {str(e)}")
-                return jsonify({'error': f"Invalid interval value: {interval}"}), 400
-
-        if "summarize the pdf" in prompt.lower() or "summarize pdf" in prompt.lower():
+        if interval_minutes is not None:
+            scheduler.schedule(agent_id, interval_minutes)
+
+        if agent.agent_type == "pdf_summarization":
             try:
-                observer = Observer()
-                event_handler = PDFHandler(agent_id)
-                observer.schedule(event_handler, UPLOAD_FOLDER, recursive=False)
-                observer.start()
-                agents[agent_id]['observer'] = observer
+                pdf_ingest.subscribe("agents", store_pdf_summary)
                 logger.info(f"Started file monitoring for agent {agent_id}")
             except Exception as e:
                 logger.error(f"Failed to start file monitoring for agent {agent_id}: {str(e)}")
 
-        response = jsonify({'agent_id': agent_id, 'output': output})
+        if job_id:
+            logger.info(f"Returning job {job_id} for agent {agent_id}")
+            return jsonify({'agent_id': agent_id, 'output': output, 'job_id': job_id, 'status_url': f"/jobs/{job_id}"}), 202
+        result = {'agent_id': agent_id, 'output': output}
+        if timing is not None and is_truthy(data.get('timing', False)):
+            result['timing'] = timing
+        response = jsonify(result)
         logger.info(f"Returning response for agent {agent_id}")
         return response
     except Exception as e:
@@ -169,36 +319,65 @@ def run_agent_endpoint(agent_id):
             logger.error(f"Agent {agent_id} not found")
             return jsonify({'error': 'Agent not found'}), 404
         
-        agent_data = agents[agent_id]
-        agent = agent_data['agent']
-        prompt = agent_data['prompt']
-        
-        logger.info(f"Manually running agent {agent_id} with prompt: {prompt}")
-        output = agent.invoke({'input': prompt})['output']
-        if agent_data.get('last_pdf_summary'):
-            output += f"\nLast PDF Summary: {agent_data['last_pdf_summary']}"
-        logger.info(f"Manual run for agent {agent_id} successful: {output}")
-        return jsonify({'agent_id': agent_id, 'output': output})
+        if is_truthy(request.args.get('async', False)):
+            job_id = jobs.submit(manual_run, agent_id, agent_id=agent_id)
+            return jsonify({'agent_id': agent_id, 'job_id': job_id, 'status_url': f"/jobs/{job_id}"}), 202
+
+        with metrics.track_timing() as timing:
+            result = manual_run(agent_id)
+        if is_truthy(request.args.get('timing', False)):
+            result['timing'] = timing
+        return jsonify(result)
     except Exception as e:
         logger.error(f"Error running agent {agent_id}: {str(e)}")
         return jsonify({'error': f"Error running agent: {str(e)}"}), 500
 
 def run_agent(agent_id):
     try:
-        if agent_id not in agents:
+        record = agents.get(agent_id)
+        if not record:
             logger.error(f"Agent {agent_id} not found for scheduled run")
             return
         
-        agent_data = agents[agent_id]
-        agent = agent_data['agent']
-        prompt = agent_data['prompt']
+        prompt = record.prompt
         
         logger.info(f"Scheduled run started for agent {agent_id} with prompt: {prompt}")
-        output = agent.invoke({'input': prompt})['output']
+        output = agents.executor(record).invoke({'input': prompt})['output']
         logger.info(f"Scheduled run for agent {agent_id} successful: {output}")
     except Exception as e:
         logger.error(f"Error in scheduled run for agent {agent_id}: {str(e)}")
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    try:
+        wait = min(float(request.args.get('wait', 0)), JOB_MAX_WAIT)
+    except ValueError:
+        return jsonify({'error': f"Invalid wait value: {request.args.get('wait')}"}), 400
+    job = jobs.wait(job_id, wait) if wait > 0 else jobs.get(job_id)
+    if not job:
+        logger.error(f"Job {job_id} not found")
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    if not jobs.get(job_id):
+        logger.error(f"Job {job_id} not found")
+        return jsonify({'error': 'Job not found'}), 404
+
+    def events():
+        while True:
+            job = jobs.wait(job_id, JOB_MAX_WAIT)
+            if not job:
+                return
+            if job['finished_at']:
+                yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+                return
+            # SSE comment line keeps proxies from closing an idle stream
+            yield ": keepalive\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
 @app.route('/upload_pdf', methods=['POST'])
 def upload_pdf():
     try:
@@ -215,31 +394,79 @@ def upload_pdf():
             logger.error(f"File {file.filename} is not a PDF")
             return jsonify({'error': 'File must be a PDF'}), 400
 
-        file_content = file.read()
-        file_hash = hashlib.md5(file_content).hexdigest()
-        file.seek(0)
-
-        for existing_file in os.listdir(UPLOAD_FOLDER):
-            existing_file_path = os.path.join(UPLOAD_FOLDER, existing_file)
-            if os.path.isfile(existing_file_path):
-                with open(existing_file_path, 'rb') as f:
-                    existing_content = f.read()
-                    existing_hash = hashlib.md5(existing_content).hexdigest()
-                if existing_hash == file_hash:
-                    logger.info(f"Duplicate PDF detected. Using existing file: {existing_file_path}")
-                    return jsonify({'file_path': existing_file_path, 'message': 'PDF already uploaded, using existing file'})
-
-        filename = f"{uuid.uuid4()}.pdf"
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(file_path)
-        logger.info(f"PDF uploaded successfully: {file_path}")
-        
-        return jsonify({'file_path': file_path, 'message': 'PDF uploaded successfully'})
+        upload = file.stream
+        if not isinstance(upload, HashingFile):
+            upload = HashingFile(UPLOAD_FOLDER, MAX_UPLOAD_BYTES)
+            request.__dict__.setdefault('upload_files', []).append(upload)
+            copy_stream(file.stream, upload)
+        return store_upload(upload.hexdigest(), upload.commit)
+    except (UploadTooLarge, RequestEntityTooLarge):
+        raise
     except Exception as e:
         logger.error(f"Error uploading PDF: {str(e)}")
         return jsonify({'error': f"Error uploading PDF: {str(e)}"}), 500
 
+def store_upload(file_hash, commit):
+    existing_file_path = upload_index.lookup(file_hash)
+    if existing_file_path:
+        logger.info(f"Duplicate PDF detected. Using existing file: {existing_file_path}")
+        return jsonify({'file_path': existing_file_path, 'message': 'PDF already uploaded, using existing file'})
+
+    filename = f"{uuid.uuid4()}.pdf"
+    file_path = os.path.join(UPLOAD_FOLDER, filename)
+    commit(file_path)
+    upload_index.add(file_path, file_hash)
+    logger.info(f"PDF uploaded successfully: {file_path}")
+
+    return jsonify({'file_path': file_path, 'message': 'PDF uploaded successfully'})
+
+@app.route('/upload_pdf/chunked', methods=['POST'])
+def start_chunked_upload():
+    upload_id = chunked_uploads.create()
+    return jsonify({'upload_id': upload_id, 'offset': 0})
+
+@app.route('/upload_pdf/chunked/<upload_id>', methods=['GET', 'POST'])
+def upload_chunk(upload_id):
+    try:
+        if request.method == 'GET':
+            return jsonify({'upload_id': upload_id, 'offset': chunked_uploads.offset(upload_id)})
+        try:
+            offset = int(request.args.get('offset', ''))
+        except ValueError:
+            return jsonify({'error': 'offset must be an integer'}), 400
+        new_offset = chunked_uploads.append(upload_id, offset, request.stream)
+        return jsonify({'upload_id': upload_id, 'offset': new_offset})
+    except KeyError:
+        logger.error(f"Unknown chunked upload {upload_id}")
+        return jsonify({'error': f"Upload {upload_id} not found"}), 404
+    except ValueError as e:
+        # Lost or repeated chunk; the client resumes from the offset the server has
+        logger.warning(f"Offset mismatch for chunked upload {upload_id}, expected {e.args[0]}")
+        return jsonify({'error': 'Offset mismatch', 'offset': e.args[0]}), 409
+
+@app.route('/upload_pdf/chunked/<upload_id>/complete', methods=['POST'])
+def complete_chunked_upload(upload_id):
+    try:
+        part_path, file_hash = chunked_uploads.complete(upload_id)
+    except KeyError:
+        logger.error(f"Unknown chunked upload {upload_id}")
+        return jsonify({'error': f"Upload {upload_id} not found"}), 404
+    except ValueError:
+        logger.error(f"Chunked upload {upload_id} is not a PDF")
+        chunked_uploads.discard(upload_id)
+        return jsonify({'error': 'File must be a PDF'}), 400
+    try:
+        response = store_upload(file_hash, lambda file_path: os.replace(part_path, file_path))
+    except Exception as e:
+        logger.error(f"Error completing chunked upload {upload_id}: {str(e)}")
+        return jsonify({'error': f"Error uploading PDF: {str(e)}"}), 500
+    if os.path.exists(part_path):
+        os.remove(part_path)
+    return response
+
+metrics.record_startup('import', time.perf_counter() - _import_started)
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     logger.info(f"Starting Flask server on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    create_app().run(host='0.0.0.0', port=port, debug=False)
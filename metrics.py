@@ -0,0 +1,275 @@
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_registry = []
+_startup = {}
+_timing = contextvars.ContextVar('timing', default=None)
+_snapshot_dir = None
+_snapshot_pid = None
+_snapshot_stop = None
+_snapshot_thread = None
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, _format_labels(self.labelnames, labels), value) for labels, value in self._values.items()]
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, *labels):
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * len(self.buckets) + [0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for labels, counts in self._values.items():
+                for bound, count in zip(self.buckets, counts):
+                    samples.append((f"{self.name}_bucket", _format_labels(self.labelnames, labels, [('le', bound)]), count))
+                samples.append((f"{self.name}_bucket", _format_labels(self.labelnames, labels, [('le', '+Inf')]), counts[-2]))
+                samples.append((f"{self.name}_count", _format_labels(self.labelnames, labels), counts[-2]))
+                samples.append((f"{self.name}_sum", _format_labels(self.labelnames, labels), counts[-1]))
+        return samples
+
+class CallbackMetric:
+    """A metric whose values are read from a callback returning {label values tuple: value} at scrape time."""
+
+    def __init__(self, name, help, type, labelnames, callback):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.labelnames = labelnames
+        self.callback = callback
+        _registry.append(self)
+
+    def samples(self):
+        return [(self.name, _format_labels(self.labelnames, labels), value) for labels, value in self.callback().items()]
+
+def _with_pid(labels, pid):
+    return f'{labels[:-1]},pid="{pid}"}}' if labels else f'{{pid="{pid}"}}'
+
+def _families(pid_labels=False):
+    families = []
+    for metric in _registry:
+        samples = metric.samples()
+        if pid_labels and metric.type == 'gauge':
+            # Gauges describe one process, so they are reported per worker rather than summed
+            samples = [(name, _with_pid(labels, os.getpid()), value) for name, labels, value in samples]
+        families.append((metric.name, metric.help, metric.type, samples))
+    return families
+
+def _format(families):
+    lines = []
+    for name, help, type, samples in families:
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {type}")
+        for sample, labels, value in samples:
+            lines.append(f"{sample}{labels} {value}")
+    return '\n'.join(lines) + '\n'
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def write_snapshot():
+    """Save this process's metrics where the other workers' render() reads them."""
+    path = os.path.join(_snapshot_dir, f"{os.getpid()}.json")
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(_families(pid_labels=True), f)
+    os.replace(f"{path}.tmp", path)
+
+def _read_snapshots():
+    snapshots = []
+    for entry in os.scandir(_snapshot_dir):
+        pid = entry.name[:-len('.json')]
+        if not entry.name.endswith('.json') or not pid.isdigit() or int(pid) == os.getpid():
+            continue
+        try:
+            with open(entry.path) as f:
+                snapshots.append((int(pid), json.load(f)))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+def _merge(families, snapshots):
+    merged = {name: (help, type, {(sample, labels): value for sample, labels, value in samples}) for name, help, type, samples in families}
+    for pid, snapshot in snapshots:
+        live = _alive(pid)
+        for name, help, type, samples in snapshot:
+            values = merged.setdefault(name, (help, type, {}))[2]
+            if type == 'gauge' and not live:
+                continue
+            # Counters and histograms of exited workers still count, so totals never go backwards
+            for sample, labels, value in samples:
+                values[(sample, labels)] = values.get((sample, labels), 0) + value
+    return [(name, help, type, [(sample, labels, value) for (sample, labels), value in values.items()]) for name, (help, type, values) in merged.items()]
+
+def render():
+    if not _snapshot_dir:
+        return _format(_families())
+    write_snapshot()
+    return _format(_merge(_families(pid_labels=True), _read_snapshots()))
+
+def start_snapshots(directory, interval=5):
+    """Share this process's metrics through directory so any worker's /metrics covers all of them.
+
+    Each process rewrites {pid}.json every interval seconds and on stop_snapshots(),
+    and render() adds up the counters and histograms of every file, while gauges keep
+    a pid label and are only reported for processes that are still running.
+    """
+    global _snapshot_dir, _snapshot_pid, _snapshot_stop, _snapshot_thread
+    if not directory or _snapshot_pid == os.getpid():
+        return
+    os.makedirs(directory, exist_ok=True)
+    _snapshot_dir = directory
+    _snapshot_pid = os.getpid()
+    _snapshot_stop = threading.Event()
+    _snapshot_thread = threading.Thread(target=_write_snapshots, args=(_snapshot_stop, interval), name='metrics-snapshots', daemon=True)
+    _snapshot_thread.start()
+
+def _write_snapshots(stop, interval):
+    while not stop.wait(interval):
+        try:
+            write_snapshot()
+        except OSError:
+            pass
+
+def stop_snapshots():
+    global _snapshot_pid
+    if _snapshot_pid != os.getpid():
+        return
+    _snapshot_stop.set()
+    _snapshot_thread.join()
+    write_snapshot()
+    _snapshot_pid = None
+
+def clear_snapshots(directory):
+    """Remove the snapshots of a previous run; call it before the workers start."""
+    if not directory or not os.path.isdir(directory):
+        return
+    for entry in os.scandir(directory):
+        if entry.name.endswith(('.json', '.json.tmp')):
+            os.remove(entry.path)
+
+@contextmanager
+def track_timing():
+    """Collect a per-request breakdown of timed sections (in milliseconds) on the current thread."""
+    timing = {}
+    token = _timing.set(timing)
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        timing['total_ms'] = (time.perf_counter() - start) * 1000
+        _timing.reset(token)
+
+def record_timing(key, seconds):
+    timing = _timing.get()
+    if timing is not None:
+        timing[key] = timing.get(key, 0) + seconds * 1000
+
+@contextmanager
+def timed(histogram, errors, *labels, timing_key=None):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        errors.inc(*labels)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed, *labels)
+        if timing_key:
+            record_timing(timing_key, elapsed)
+
+def record_startup(phase, seconds):
+    _startup[(phase,)] = seconds
+
+def memory_usage():
+    """Return {'resident': current RSS, 'max_resident': peak RSS} in bytes, with whatever this platform reports."""
+    usage = {}
+    try:
+        with open('/proc/self/statm') as f:
+            usage['resident'] = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        usage['max_resident'] = max_rss if sys.platform == 'darwin' else max_rss * 1024
+    return usage
+
+AGENT_INVOKE_SECONDS = Histogram('agent_invoke_seconds', 'Latency of SimpleAgentExecutor.invoke', ('agent_type',))
+AGENT_INVOKE_ERRORS = Counter('agent_invoke_errors_total', 'Agent invocations that raised', ('agent_type',))
+TOOL_SECONDS = Histogram('tool_call_seconds', 'Latency of tool calls', ('tool',))
+TOOL_ERRORS = Counter('tool_errors_total', 'Tool calls that raised or returned an error', ('tool',))
+HTTP_REQUEST_SECONDS = Histogram('http_request_seconds', 'Latency of HTTP requests', ('endpoint', 'method', 'status'))
+SCHEDULER_LAG_SECONDS = Histogram('scheduler_lag_seconds', 'Delay between a job\'s scheduled and actual submission', buckets=(0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 300))
+SCHEDULER_MISSED = Counter('scheduler_missed_runs_total', 'Scheduled runs skipped after the misfire grace time')
+
+CallbackMetric('app_startup_seconds', 'Time this worker spent importing the app and starting its services', 'gauge', ('phase',), lambda: dict(_startup))
+CallbackMetric('process_memory_bytes', 'Resident memory of this worker process', 'gauge', ('type',), lambda: {(kind,): value for kind, value in memory_usage().items()})
+
+def instrument_tool(name, tool):
+    def call(input):
+        with timed(TOOL_SECONDS, TOOL_ERRORS, name, timing_key=f"{name}_ms"):
+            result = tool(input)
+        if isinstance(result, dict) and result.get("error"):
+            TOOL_ERRORS.inc(name)
+        return result
+    return call
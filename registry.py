@@ -0,0 +1,129 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class AgentRecord:
+    __slots__ = ('agent_id', 'prompt', 'interval', 'agent_type', 'last_pdf_summary', 'created_at')
+
+    def __init__(self, agent_id, prompt, interval, agent_type, last_pdf_summary=None, created_at=None):
+        self.agent_id = agent_id
+        self.prompt = prompt
+        self.interval = interval
+        self.agent_type = agent_type
+        self.last_pdf_summary = last_pdf_summary
+        self.created_at = created_at or time.time()
+
+    def to_dict(self):
+        return {
+            'agent_id': self.agent_id,
+            'prompt': self.prompt,
+            'interval': self.interval,
+            'agent_type': self.agent_type,
+            'last_pdf_summary': self.last_pdf_summary
+        }
+
+_COLUMNS = 'agent_id, prompt, interval, agent_type, last_pdf_summary, created_at'
+
+class AgentRegistry:
+    """SQLite-backed agent store; executors are built on first use and kept in a bounded LRU."""
+
+    def __init__(self, db_path, executor_factory, executor_cache_size=1024):
+        self.db_path = db_path
+        self.executor_factory = executor_factory
+        self.executor_cache_size = executor_cache_size
+        self._local = threading.local()
+        self._executors = OrderedDict()
+        self._executors_lock = threading.Lock()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS agents ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, agent_id TEXT UNIQUE NOT NULL, prompt TEXT NOT NULL, "
+            "interval TEXT, agent_type TEXT NOT NULL, last_pdf_summary TEXT, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS agents_type ON agents (agent_type, id)")
+        conn.commit()
+
+    def _conn(self):
+        # sqlite3 connections are not shared between threads or with forked workers; WAL lets them read concurrently
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, record, executor=None):
+        conn = self._conn()
+        conn.execute(
+            f"INSERT INTO agents ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            (record.agent_id, record.prompt, record.interval, record.agent_type, record.last_pdf_summary, record.created_at)
+        )
+        conn.commit()
+        if executor is not None:
+            self._remember(record.agent_id, executor)
+
+    def get(self, agent_id):
+        row = self._conn().execute(f"SELECT {_COLUMNS} FROM agents WHERE agent_id = ?", (agent_id,)).fetchone()
+        return AgentRecord(*row) if row else None
+
+    def __contains__(self, agent_id):
+        return self._conn().execute("SELECT 1 FROM agents WHERE agent_id = ?", (agent_id,)).fetchone() is not None
+
+    def has_type(self, agent_type):
+        return self._conn().execute("SELECT 1 FROM agents WHERE agent_type = ? LIMIT 1", (agent_type,)).fetchone() is not None
+
+    def list(self, limit=100, cursor=0, agent_type=None, query=None, agent_id=None):
+        """Return up to limit records after the cursor and the cursor for the next page (None at the end)."""
+        clauses = ["id > ?"]
+        params = [cursor]
+        if agent_type:
+            clauses.append("agent_type = ?")
+            params.append(agent_type)
+        if query:
+            clauses.append("prompt LIKE ? ESCAPE '\\'")
+            params.append('%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if agent_id:
+            clauses.append("agent_id = ?")
+            params.append(agent_id)
+        rows = self._conn().execute(
+            f"SELECT id, {_COLUMNS} FROM agents WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [AgentRecord(*row[1:]) for row in rows[:limit]], next_cursor
+
+    def scheduled(self, after=0):
+        """Return (row id, agent_id, interval) for agents with an interval, in insertion order after the given row id."""
+        return self._conn().execute(
+            "SELECT id, agent_id, interval FROM agents WHERE id > ? AND interval IS NOT NULL AND trim(interval) != '' ORDER BY id",
+            (after,)
+        ).fetchall()
+
+    def set_pdf_summary(self, agent_type, summary):
+        conn = self._conn()
+        updated = conn.execute("UPDATE agents SET last_pdf_summary = ? WHERE agent_type = ?", (summary, agent_type)).rowcount
+        conn.commit()
+        return updated
+
+    def executor(self, record):
+        with self._executors_lock:
+            executor = self._executors.get(record.agent_id)
+            if executor is not None:
+                self._executors.move_to_end(record.agent_id)
+                return executor
+        executor = self.executor_factory(record.prompt)
+        self._remember(record.agent_id, executor)
+        return executor
+
+    def _remember(self, agent_id, executor):
+        with self._executors_lock:
+            self._executors[agent_id] = executor
+            self._executors.move_to_end(agent_id)
+            while len(self._executors) > self.executor_cache_size:
+                self._executors.popitem(last=False)
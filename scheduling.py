@@ -0,0 +1,105 @@
+import os
+import random
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MISSED
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.triggers.interval import IntervalTrigger
+import metrics
+from file_lock import FLOCK_AVAILABLE, LeaderLock
+
+logger = logging.getLogger(__name__)
+
+class AgentScheduler:
+    """Runs interval agents on APScheduler.
+
+    In 'shared' mode every worker process creates one of these, but only the process
+    holding the lock file schedules agent jobs, loading them from the agent registry so
+    jobs survive restarts and run once across workers. Other processes retry the lock
+    every sync_interval seconds and take over if the leader exits. In 'local' mode each
+    process schedules only the agents it created, as before.
+    """
+
+    def __init__(self, run_agent, registry, mode='shared', lock_path='scheduler.lock', max_workers=10,
+                 jitter=0.1, misfire_grace_time=60, sync_interval=30):
+        self.run_agent = run_agent
+        self.registry = registry
+        self.mode = mode
+        self.lock_path = lock_path
+        self._leader = LeaderLock(lock_path)
+        self.jitter = jitter
+        self.sync_interval = sync_interval
+        self.is_leader = mode == 'local'
+        self.scheduler = BackgroundScheduler(
+            executors={'default': ThreadPoolExecutor(max_workers)},
+            job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': misfire_grace_time}
+        )
+        self._synced_id = 0
+        self._sync_lock = threading.Lock()
+        self.scheduler.add_listener(self._record_lag, EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED)
+
+    def _record_lag(self, event):
+        if event.code == EVENT_JOB_MISSED:
+            metrics.SCHEDULER_MISSED.inc()
+            return
+        now = datetime.now(timezone.utc)
+        for run_time in event.scheduled_run_times:
+            metrics.SCHEDULER_LAG_SECONDS.observe(max((now - run_time).total_seconds(), 0))
+
+    def start(self):
+        self.scheduler.start()
+        logger.info(f"APScheduler started successfully in {self.mode} mode")
+        if self.mode == 'shared':
+            self._elect()
+            self.scheduler.add_job(self._elect, trigger=IntervalTrigger(seconds=self.sync_interval), id='scheduler-sync', replace_existing=True)
+
+    def shutdown(self):
+        self.scheduler.shutdown()
+        if self.mode == 'shared':
+            self._leader.release()
+            self.is_leader = False
+
+    def _elect(self):
+        if not self.is_leader:
+            if not self._leader.acquire():
+                return
+            if not FLOCK_AVAILABLE:
+                logger.warning("File locking is unavailable on this platform, scheduling without leader election")
+            self.is_leader = True
+            logger.info(f"Process {os.getpid()} is now the scheduler leader")
+        self.sync()
+
+    def sync(self):
+        """Add jobs for interval agents registered since the last sync, by this or another worker."""
+        with self._sync_lock:
+            for row_id, agent_id, interval in self.registry.scheduled(after=self._synced_id):
+                self._synced_id = row_id
+                if self.scheduler.get_job(agent_id):
+                    continue
+                try:
+                    minutes = float(interval)
+                except ValueError:
+                    continue
+                if not minutes > 0:
+                    continue
+                # The last run time is unknown, so spread restored jobs across their first interval
+                first_run = datetime.now() + timedelta(minutes=random.uniform(0, minutes))
+                self._add(agent_id, minutes, start_date=first_run)
+
+    def schedule(self, agent_id, minutes):
+        if self.is_leader:
+            self._add(agent_id, minutes)
+            logger.info(f"Agent {agent_id} scheduled to run every {minutes} minutes")
+        else:
+            logger.info(f"Agent {agent_id} will be scheduled every {minutes} minutes by the scheduler leader")
+
+    def _add(self, agent_id, minutes, start_date=None):
+        self.scheduler.add_job(
+            self.run_agent,
+            trigger=IntervalTrigger(minutes=minutes, start_date=start_date, jitter=minutes * 60 * self.jitter or None),
+            args=[agent_id],
+            id=agent_id,
+            replace_existing=True
+        )
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+
+from stubs import HNStub, SMTPStub, TwitterStub
+
+@pytest.fixture
+def hn_stub():
+    stub = HNStub().start()
+    yield stub
+    stub.stop()
+
+@pytest.fixture
+def smtp_stub():
+    stub = SMTPStub().start()
+    yield stub
+    stub.stop()
+
+@pytest.fixture
+def twitter_stub(request, monkeypatch):
+    """TwitterStub trusted by requests; parametrize indirectly to pass its keyword arguments."""
+    if not TwitterStub.available():
+        pytest.skip("the Twitter stub needs the openssl binary")
+    stub = TwitterStub(**getattr(request, 'param', {})).start()
+    monkeypatch.setenv('REQUESTS_CA_BUNDLE', stub.cert_path)
+    yield stub
+    stub.stop()
+
+@pytest.fixture(scope='session')
+def app_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp('app')
+
+@pytest.fixture(scope='session')
+def main_module(app_dir):
+    """main imported with its databases, uploads and log in a temporary directory."""
+    cwd = os.getcwd()
+    os.chdir(app_dir)
+    os.environ.update({'LOG_FILE': str(app_dir / 'agent_builder.log'), 'SCHEDULER_MODE': 'local'})
+    try:
+        import main
+        yield main
+        main.stop_services()
+    finally:
+        os.chdir(cwd)
+
+@pytest.fixture
+def client(main_module, app_dir, monkeypatch):
+    # main keeps relative paths such as uploads/, so requests must run from its directory
+    monkeypatch.chdir(app_dir)
+    return main_module.app.test_client()
@@ -0,0 +1,61 @@
+import pytest
+
+import agents
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Let a test register intents without leaking them into the module's registry."""
+    monkeypatch.setattr(agents, 'intents', list(agents.intents))
+    monkeypatch.setattr(agents, 'intents_by_name', dict(agents.intents_by_name))
+    monkeypatch.setattr(agents, '_router', None)
+    return agents
+
+def names():
+    return [intent.name for intent in agents.intents]
+
+def run(tools, args):
+    return {'output': 'ran'}
+
+@pytest.mark.parametrize('prompt, agent_type', [
+    ("Scrape top headlines from Hacker News and email them to a@example.com", 'hacker_news'),
+    ("Summarize Elon Musk's tweets", 'twitter_summarization'),
+    ("Summarize the PDF at uploads/report.pdf", 'pdf_summarization'),
+    ("Summarize the PDF of Elon Musk's tweets and scrape top headlines", 'pdf_summarization'),
+    ("Scrape top headlines and a summary of Elon Musk", 'twitter_summarization'),
+    ("What is the weather like?", 'unknown'),
+])
+def test_routing_follows_intent_priority(prompt, agent_type):
+    assert names() == ['pdf_summarization', 'twitter_summarization', 'hacker_news']
+    assert agents.plan_prompt(prompt).agent_type == agent_type
+
+def test_hacker_news_plan_uses_the_last_recipient():
+    plan = agents.plan_prompt("Scrape top headlines, email them to a@example.com, no, email them to b@example.com")
+    assert plan.args == {'url': agents.HACKER_NEWS_URL, 'recipient': 'b@example.com'}
+    assert agents.plan_prompt("Scrape top headlines").args['recipient'] == 'user@example.com'
+
+def test_pdf_plan_extracts_the_path():
+    assert agents.plan_prompt("Summarize the PDF at uploads/Q3 report.pdf").args == {'file_path': 'report.pdf'}
+    assert agents.plan_prompt("summarize pdf /data/uploads/a.PDF now").args == {'file_path': '/data/uploads/a.PDF'}
+    assert agents.plan_prompt("Summarize the PDF please").args == {'file_path': None}
+
+def test_new_intents_are_tried_last(registry):
+    registry.register_intent('weather', r'weather', run)
+    assert names()[-1] == 'weather'
+    assert registry.plan_prompt("Scrape top headlines about the weather").agent_type == 'hacker_news'
+    assert registry.plan_prompt("What is the weather like?").agent_type == 'weather'
+
+def test_before_places_the_intent_ahead_of_the_named_one(registry):
+    registry.register_intent('weather', r'weather', run, before='twitter_summarization')
+    assert names() == ['pdf_summarization', 'weather', 'twitter_summarization', 'hacker_news']
+    assert registry.plan_prompt("Elon Musk tweets about the weather").agent_type == 'weather'
+
+def test_reregistering_moves_the_intent_before_a_later_one(registry):
+    registry.register_intent('pdf_summarization', r"summarize (?:the )?pdf", run, before='hacker_news')
+    assert names() == ['twitter_summarization', 'pdf_summarization', 'hacker_news']
+    assert registry.plan_prompt("Summarize the PDF of Elon Musk's tweets").agent_type == 'twitter_summarization'
+
+def test_unknown_before_is_rejected(registry):
+    with pytest.raises(ValueError):
+        registry.register_intent('weather', r'weather', run, before='missing')
+    assert names() == ['pdf_summarization', 'twitter_summarization', 'hacker_news']
+    assert 'weather' not in registry.intents_by_name
@@ -0,0 +1,33 @@
+import pytest
+
+from file_index import FileIndex, hash_file
+from file_lock import LeaderLock
+
+def test_sync_indexes_new_files_and_forgets_removed_ones(tmp_path):
+    folder = tmp_path / 'uploads'
+    folder.mkdir()
+    (folder / 'a.pdf').write_bytes(b'%PDF-a')
+    (folder / 'b.pdf').write_bytes(b'%PDF-b')
+    index = FileIndex(str(folder), db_path=str(tmp_path / 'index.db'))
+
+    assert index.sync()
+    assert index.lookup(hash_file(str(folder / 'a.pdf'))) == str(folder / 'a.pdf')
+    (folder / 'a.pdf').unlink()
+    index.sync()
+    assert [row[0] for row in index._conn().execute("SELECT path FROM files")] == [str(folder / 'b.pdf')]
+
+def test_sync_is_skipped_while_another_worker_holds_the_lock(tmp_path):
+    pytest.importorskip('fcntl')
+    folder = tmp_path / 'uploads'
+    folder.mkdir()
+    (folder / 'a.pdf').write_bytes(b'%PDF-a')
+    lock_path = str(tmp_path / 'index.lock')
+    index = FileIndex(str(folder), db_path=str(tmp_path / 'index.db'), lock_path=lock_path)
+    other = LeaderLock(lock_path)
+
+    assert other.acquire()
+    assert not index.sync()
+    assert index.lookup(hash_file(str(folder / 'a.pdf'))) is None
+    other.release()
+    assert index.sync()
+    assert index.lookup(hash_file(str(folder / 'a.pdf'))) == str(folder / 'a.pdf')
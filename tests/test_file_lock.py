@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from file_lock import LeaderLock
+
+pytest.importorskip('fcntl')
+
+def test_only_one_holder_at_a_time(tmp_path):
+    path = str(tmp_path / 'leader.lock')
+    first, second = LeaderLock(path), LeaderLock(path)
+
+    assert first.acquire()
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
+
+def test_forked_child_does_not_inherit_the_lock(tmp_path):
+    lock = LeaderLock(str(tmp_path / 'leader.lock'))
+    assert lock.acquire()
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if not lock.acquire() else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    lock.release()
@@ -0,0 +1,43 @@
+import pytest
+
+import tools
+
+def test_expired_headlines_are_revalidated_without_reparsing(hn_stub, monkeypatch):
+    parsed = []
+    parse_headlines = tools.parse_headlines
+    monkeypatch.setattr(tools, 'HEADLINES_TTL', 0)
+    monkeypatch.setattr(tools, '_headline_cache', {})
+    monkeypatch.setattr(tools, 'parse_headlines', lambda *args: parsed.append(args) or parse_headlines(*args))
+
+    first = tools.fetch_headlines(hn_stub.url)
+    second = tools.fetch_headlines(hn_stub.url)
+
+    assert len(first) == tools.HEADLINES_LIMIT
+    assert second == first
+    assert hn_stub.requests == 2
+    assert len(parsed) == 1
+
+def test_fresh_headlines_are_served_from_the_cache(hn_stub, monkeypatch):
+    monkeypatch.setattr(tools, 'HEADLINES_TTL', 60)
+    monkeypatch.setattr(tools, '_headline_cache', {})
+
+    assert tools.fetch_headlines(hn_stub.url) == tools.fetch_headlines(hn_stub.url)
+    assert hn_stub.requests == 1
+
+LINKLESS_TITLELINE = """<table>
+<tr class="athing"><td><span class="titleline">[flagged]</span></td></tr>
+<tr><td class="subtext"><a href="user?id=someuser" class="hnuser">someuser</a></td></tr>
+<tr class="athing"><td><span class="titleline"><a href="https://example.com">Real &amp; title</a>
+<span class="sitebit comhead"> (<a href="from?site=example.com"><span class="sitestr">example.com</span></a>)</span></span></td></tr>
+<tr><td class="subtext"><a href="user?id=other" class="hnuser">other</a></td></tr>
+</table>"""
+
+@pytest.mark.parametrize('engine', [name for name in tools.headline_engines if name != 'lxml' or tools.LXML_AVAILABLE])
+def test_engines_skip_titlelines_without_a_link(engine):
+    assert tools.parse_headlines(LINKLESS_TITLELINE, 5, engine) == ['Real & title']
+
+@pytest.mark.parametrize('engine', [name for name in tools.headline_engines if name != 'lxml' or tools.LXML_AVAILABLE])
+def test_engines_agree_on_the_front_page(engine):
+    from fixtures import hn_front_page
+    html = hn_front_page(30)
+    assert tools.parse_headlines(html, 30, engine) == tools.parse_headlines(html, 30, 'soup')
@@ -0,0 +1,44 @@
+from email.mime.text import MIMEText
+
+import pytest
+
+from mailer import SMTPPool, Outbox
+
+def message(recipient='reader@example.com'):
+    msg = MIMEText('body')
+    msg['To'] = recipient
+    msg['Subject'] = 'Headlines'
+    return msg
+
+def test_dropped_session_is_reconnected_mid_batch(smtp_stub):
+    pool = SMTPPool(smtp_stub.host, smtp_stub.port, size=1, starttls=False, noop_after=3600)
+    assert pool.send_batch([message()]) == [None]
+
+    # The idle session looks healthy but its socket is gone, as after a server timeout
+    server, last_used = pool._idle.get_nowait()
+    server.close()
+    pool._idle.put((server, last_used))
+
+    assert pool.send_batch([message(), message()]) == [None, None]
+    assert smtp_stub.requests == 3
+    pool.close()
+
+def test_unexpected_errors_release_the_session(smtp_stub):
+    pool = SMTPPool(smtp_stub.host, smtp_stub.port, size=1, starttls=False)
+    with pytest.raises(AttributeError):
+        pool.send_batch([object()])
+    # With a pool of one, a leaked slot would block here forever
+    assert pool._slots.acquire(timeout=1)
+    pool._slots.release()
+    assert pool._idle.empty()
+    assert pool.send_batch([message()]) == [None]
+    pool.close()
+
+def test_outbox_flush_waits_for_delivery(smtp_stub):
+    pool = SMTPPool(smtp_stub.host, smtp_stub.port, starttls=False)
+    outbox = Outbox(pool, batch_size=5)
+    for i in range(20):
+        outbox.put(message(f"reader{i}@example.com"))
+    assert outbox.flush(timeout=10)
+    assert smtp_stub.requests == 20
+    pool.close()
@@ -0,0 +1,59 @@
+import os
+import json
+import subprocess
+import sys
+
+import pytest
+
+import metrics
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    """Fresh metrics registry that shares snapshots through tmp_path."""
+    monkeypatch.setattr(metrics, '_registry', [])
+    monkeypatch.setattr(metrics, '_snapshot_dir', str(tmp_path))
+    return tmp_path
+
+def write_worker(directory, pid, families):
+    (directory / f"{pid}.json").write_text(json.dumps(families))
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def test_render_adds_up_every_worker(registry):
+    requests = metrics.Counter('requests_total', 'Requests', ('endpoint',))
+    latency = metrics.Histogram('latency_seconds', 'Latency', buckets=(1,))
+    memory = metrics.CallbackMetric('memory_bytes', 'Memory', 'gauge', (), lambda: {(): 100})
+    requests.inc('/run')
+    latency.observe(0.5)
+
+    # Another running worker, and one that has exited
+    for pid, memory_bytes in ((os.getppid(), 200), (exited_pid(), 300)):
+        write_worker(registry, pid, [
+            ['requests_total', 'Requests', 'counter', [['requests_total', '{endpoint="/run"}', 2]]],
+            ['latency_seconds', 'Latency', 'histogram', [['latency_seconds_count', '', 1], ['latency_seconds_sum', '', 2.0]]],
+            ['memory_bytes', 'Memory', 'gauge', [['memory_bytes', f'{{pid="{pid}"}}', memory_bytes]]],
+        ])
+
+    lines = metrics.render().splitlines()
+    assert 'requests_total{endpoint="/run"} 5' in lines
+    assert 'latency_seconds_count 3' in lines
+    assert 'latency_seconds_sum 4.5' in lines
+    assert f'memory_bytes{{pid="{os.getpid()}"}} 100' in lines
+    assert f'memory_bytes{{pid="{os.getppid()}"}} 200' in lines
+    assert not any(line.startswith('memory_bytes') and line.endswith(' 300') for line in lines)
+    assert (registry / f"{os.getpid()}.json").exists()
+
+def test_render_without_a_directory_reports_this_process(registry, monkeypatch):
+    monkeypatch.setattr(metrics, '_snapshot_dir', None)
+    metrics.CallbackMetric('memory_bytes', 'Memory', 'gauge', (), lambda: {(): 100})
+    write_worker(registry, os.getppid(), [['memory_bytes', 'Memory', 'gauge', [['memory_bytes', '{pid="1"}', 200]]]])
+    assert metrics.render().splitlines()[-1] == 'memory_bytes 100'
+
+def test_clear_snapshots_removes_only_snapshots(tmp_path):
+    write_worker(tmp_path, 123, [])
+    (tmp_path / 'notes.txt').write_text('keep')
+    metrics.clear_snapshots(str(tmp_path))
+    assert [path.name for path in tmp_path.iterdir()] == ['notes.txt']
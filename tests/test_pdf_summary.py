@@ -0,0 +1,24 @@
+import pytest
+
+import tools
+from fixtures import make_pdf
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / 'report.pdf'
+    path.write_bytes(make_pdf(3, words_per_page=50, seed=7))
+    return str(path)
+
+def test_streamed_summary_yields_each_page(pdf_path):
+    pages = list(tools.summarize_pdf(pdf_path, stream=True)['output'])
+    assert len(pages) == 3
+    assert all(page.split() for page in pages)
+
+@pytest.mark.parametrize('content', [None, b'%PDF-1.4 this is not really a pdf'])
+def test_streamed_summary_reports_unreadable_files(tmp_path, content):
+    path = tmp_path / 'broken.pdf'
+    if content is not None:
+        path.write_bytes(content)
+    output = tools.summarize_pdf(str(path), stream=True)['output']
+    assert isinstance(output, str)
+    assert output.startswith("Error summarizing PDF")
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from registry import AgentRecord, AgentRegistry
+from scheduling import AgentScheduler
+
+pytest.importorskip('fcntl')
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+def test_one_scheduler_leads_and_another_takes_over(tmp_path):
+    registry = AgentRegistry(str(tmp_path / 'agents.db'), lambda record: None)
+    registry.add(AgentRecord('agent-1', 'Scrape top headlines', '5', 'hacker_news'))
+    lock_path = str(tmp_path / 'scheduler.lock')
+    # flock is held per open file, so two schedulers in one process compete like two workers
+    first = AgentScheduler(lambda agent_id: None, registry, lock_path=lock_path, sync_interval=1)
+    second = AgentScheduler(lambda agent_id: None, registry, lock_path=lock_path, sync_interval=1)
+    first.start()
+    second.start()
+    try:
+        assert first.is_leader
+        assert not second.is_leader
+        assert first.scheduler.get_job('agent-1')
+        assert not second.scheduler.get_job('agent-1')
+
+        first.shutdown()
+        assert wait_for(lambda: second.is_leader)
+        assert second.scheduler.get_job('agent-1')
+    finally:
+        if first.scheduler.running:
+            first.shutdown()
+        second.shutdown()
+
+def test_followers_do_not_schedule_new_agents(tmp_path):
+    registry = AgentRegistry(str(tmp_path / 'agents.db'), lambda record: None)
+    lock_path = str(tmp_path / 'scheduler.lock')
+    leader = AgentScheduler(lambda agent_id: None, registry, lock_path=lock_path, sync_interval=1)
+    follower = AgentScheduler(lambda agent_id: None, registry, lock_path=lock_path, sync_interval=1)
+    leader.start()
+    follower.start()
+    try:
+        registry.add(AgentRecord('agent-2', 'Scrape top headlines', '5', 'hacker_news'))
+        follower.schedule('agent-2', 5)
+        assert wait_for(lambda: leader.scheduler.get_job('agent-2'))
+        assert not follower.scheduler.get_job('agent-2')
+    finally:
+        leader.shutdown()
+        follower.shutdown()
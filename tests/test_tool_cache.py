@@ -0,0 +1,83 @@
+import time
+import threading
+
+import pytest
+
+from tool_cache import ToolCache
+
+def test_concurrent_calls_share_one_execution():
+    cache = ToolCache({'scrape': 60})
+    release = threading.Event()
+    calls = []
+
+    def tool(input):
+        calls.append(input)
+        release.wait(5)
+        return {'output': f"headlines for {input['url']}"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.call('scrape', tool, {'url': 'hn'}))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()['coalesced'] < 7:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'output': 'headlines for hn'}] * 8
+    assert cache.call('scrape', tool, {'url': 'hn'}) == {'output': 'headlines for hn'}
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'coalesced': 7, 'entries': 1}
+
+def test_exceptions_are_not_cached():
+    cache = ToolCache({'scrape': 60})
+    outcomes = [RuntimeError('network down'), {'output': 'headlines'}]
+
+    def tool(input):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError):
+        cache.call('scrape', tool, {'url': 'hn'})
+    assert cache.call('scrape', tool, {'url': 'hn'}) == {'output': 'headlines'}
+    assert cache.stats()['entries'] == 1
+
+def test_error_outputs_are_not_cached():
+    cache = ToolCache({'scrape': 60})
+    calls = []
+
+    def tool(input):
+        calls.append(input)
+        return {'output': 'Error scraping headlines: timed out', 'error': True}
+
+    cache.call('scrape', tool, {'url': 'hn'})
+    cache.call('scrape', tool, {'url': 'hn'})
+    assert len(calls) == 2
+    assert cache.stats()['entries'] == 0
+
+def test_outputs_mentioning_errors_are_cached():
+    cache = ToolCache({'scrape': 60})
+    calls = []
+
+    def tool(input):
+        calls.append(input)
+        return {'output': '1. Counter-terror bill passes\n2. Error correction for qubits'}
+
+    cache.call('scrape', tool, {'url': 'hn'})
+    cache.call('scrape', tool, {'url': 'hn'})
+    assert len(calls) == 1
+    assert cache.stats()['entries'] == 1
+
+def test_tool_errors_are_counted_from_the_error_key():
+    import metrics
+
+    def errors(tool):
+        return sum(value for _, labels, value in metrics.TOOL_ERRORS.samples() if labels == f'{{tool="{tool}"}}')
+
+    metrics.instrument_tool('terror_headlines', lambda input: {'output': '1. Counter-terror bill passes'})({})
+    metrics.instrument_tool('failing_headlines', lambda input: {'output': 'timed out', 'error': True})({})
+    assert errors('terror_headlines') == 0
+    assert errors('failing_headlines') == 1
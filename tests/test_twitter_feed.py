@@ -0,0 +1,41 @@
+import pytest
+
+from twitter_feed import RateLimited, TimelineCache
+
+def client_factory(stub):
+    def factory():
+        import tweepy
+        auth = tweepy.OAuth1UserHandler('key', 'secret', 'token', 'token-secret')
+        return tweepy.API(auth, host=stub.host, timeout=10)
+    return factory
+
+def test_refresh_fetches_only_newer_tweets_and_merges_them(twitter_stub):
+    timelines = TimelineCache(client_factory(twitter_stub), count=5, ttl=0, min_remaining=0)
+
+    first = timelines.timeline('elonmusk')
+    twitter_stub.latest_id += 2
+    second = timelines.timeline('elonmusk')
+
+    assert [tweet_id for tweet_id, _ in first] == [1000, 999, 998, 997, 996]
+    assert [tweet_id for tweet_id, _ in second] == [1002, 1001, 1000, 999, 998]
+    assert twitter_stub.since_ids == [None, 1000]
+
+@pytest.mark.parametrize('twitter_stub', [{'rate_limit': 2}], indirect=True)
+def test_cached_tweets_are_served_once_the_reserve_is_reached(twitter_stub):
+    timelines = TimelineCache(client_factory(twitter_stub), count=5, ttl=0, min_remaining=1)
+
+    first = timelines.timeline('elonmusk')
+    assert timelines.timeline('elonmusk') == first
+    with pytest.raises(RateLimited):
+        timelines.timeline('nasa')
+    assert twitter_stub.requests == 1
+    assert timelines.stats()['rate_limited'] == 2
+
+def test_cached_tweets_are_served_when_the_api_returns_429(twitter_stub):
+    timelines = TimelineCache(client_factory(twitter_stub), count=5, ttl=0, min_remaining=0)
+    first = timelines.timeline('elonmusk')
+
+    twitter_stub.remaining = 0
+    assert timelines.timeline('elonmusk') == first
+    assert timelines.remaining == 0
+    assert timelines.stats()['rate_limited'] == 1
@@ -0,0 +1,85 @@
+import io
+import os
+
+import pytest
+
+from uploads import ChunkedUploads, UploadTooLarge
+
+PDF = b'%PDF-1.4\n' + b'0' * 1000 + b'\n%%EOF\n'
+
+class FailingStream:
+    """Yields some bytes and then fails, like a client that drops mid-chunk."""
+
+    def __init__(self, data):
+        self.chunks = [data]
+
+    def read(self, size):
+        if self.chunks:
+            return self.chunks.pop()
+        raise OSError("connection reset")
+
+@pytest.fixture
+def uploads(tmp_path):
+    return ChunkedUploads(str(tmp_path), max_bytes=2000)
+
+def test_retried_offset_is_rejected(uploads):
+    upload_id = uploads.create()
+    assert uploads.append(upload_id, 0, io.BytesIO(PDF[:500])) == 500
+    with pytest.raises(ValueError) as error:
+        uploads.append(upload_id, 0, io.BytesIO(PDF[:500]))
+    assert error.value.args == (500,)
+    assert uploads.offset(upload_id) == 500
+
+def test_failed_chunk_is_truncated(uploads):
+    upload_id = uploads.create()
+    uploads.append(upload_id, 0, io.BytesIO(PDF[:500]))
+    with pytest.raises(OSError):
+        uploads.append(upload_id, 500, FailingStream(PDF[500:800]))
+    assert uploads.offset(upload_id) == 500
+    assert uploads.append(upload_id, 500, io.BytesIO(PDF[500:])) == len(PDF)
+    path, _ = uploads.complete(upload_id)
+    with open(path, 'rb') as f:
+        assert f.read() == PDF
+
+def test_oversized_chunk_is_truncated(uploads):
+    upload_id = uploads.create()
+    uploads.append(upload_id, 0, io.BytesIO(PDF))
+    with pytest.raises(UploadTooLarge):
+        uploads.append(upload_id, len(PDF), io.BytesIO(b'0' * 1500))
+    assert uploads.offset(upload_id) == len(PDF)
+
+def test_non_pdf_is_rejected_on_completion(uploads):
+    upload_id = uploads.create()
+    uploads.append(upload_id, 0, io.BytesIO(b'<html>not a pdf</html>'))
+    with pytest.raises(ValueError):
+        uploads.complete(upload_id)
+
+def test_chunked_upload_endpoints(client):
+    upload_id = client.post('/upload_pdf/chunked').get_json()['upload_id']
+    assert client.post(f'/upload_pdf/chunked/{upload_id}?offset=0', data=PDF[:600]).get_json()['offset'] == 600
+
+    retried = client.post(f'/upload_pdf/chunked/{upload_id}?offset=0', data=PDF[:600])
+    assert retried.status_code == 409
+    assert retried.get_json()['offset'] == 600
+
+    client.post(f'/upload_pdf/chunked/{upload_id}?offset=600', data=PDF[600:])
+    completed = client.post(f'/upload_pdf/chunked/{upload_id}/complete')
+    assert completed.status_code == 200
+    with open(completed.get_json()['file_path'], 'rb') as f:
+        assert f.read() == PDF
+
+def test_non_pdf_chunked_upload_is_discarded(client):
+    upload_id = client.post('/upload_pdf/chunked').get_json()['upload_id']
+    client.post(f'/upload_pdf/chunked/{upload_id}?offset=0', data=b'MZ\x90\x00 not a pdf')
+
+    response = client.post(f'/upload_pdf/chunked/{upload_id}/complete')
+    assert response.status_code == 400
+    assert client.get(f'/upload_pdf/chunked/{upload_id}').status_code == 404
+
+def test_upload_above_the_limit_is_rejected(client, main_module, monkeypatch):
+    monkeypatch.setattr(main_module, 'MAX_UPLOAD_BYTES', 1000)
+    before = set(os.listdir('uploads'))
+
+    response = client.post('/upload_pdf', data={'file': (io.BytesIO(PDF + b'0' * 1000), 'big.pdf')})
+    assert response.status_code == 413
+    assert set(os.listdir('uploads')) == before
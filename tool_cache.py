@@ -0,0 +1,86 @@
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class ToolCache:
+    """Memoizes tool results per input with per-tool TTLs and LRU eviction.
+
+    Concurrent calls with the same tool and input share a single execution. Tools
+    with a TTL of 0 are still coalesced while in flight but never stored. Tools report
+    failures by raising or by returning a result with a true "error" key.
+    """
+
+    def __init__(self, ttls, maxsize=1024):
+        self.ttls = ttls
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, name, tool):
+        return lambda input: self.call(name, tool, input)
+
+    def call(self, name, tool, input):
+        key = (name, json.dumps(input, sort_keys=True, default=str))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = tool(input)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if not call.error and self._cacheable(name, call.result):
+                    self._entries[key] = (time.monotonic() + self.ttls[name], call.result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            call.event.set()
+        return call.result
+
+    def _cacheable(self, name, result):
+        # Errors, raised or flagged with an error key, are shared with concurrent callers but never stored
+        if not isinstance(result, dict) or result.get("error"):
+            return False
+        return self.ttls.get(name, 0) > 0 and isinstance(result.get("output"), str)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'coalesced': self.coalesced, 'entries': len(self._entries)}
@@ -1,60 +1,319 @@
 import os
+import atexit
+import time
 import logging
 import smtplib
-import requests
-from bs4 import BeautifulSoup
+import threading
+import importlib.util
+from html.parser import HTMLParser
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
-import tweepy
-import PyPDF2
 from io import BytesIO
+from itertools import chain, islice
+from contextlib import closing
+from functools import lru_cache
+from file_index import hash_file
+from pdf_cache import PDFCache
+from mailer import SMTPPool, Outbox
+from tool_cache import ToolCache
+from twitter_feed import TimelineCache
+import metrics
+
+# Parsing, PDF and Twitter backends are imported on first use so workers that never
+# call a tool do not pay for loading them
+LXML_AVAILABLE = importlib.util.find_spec('lxml') is not None
 
 load_dotenv()
-logging.basicConfig(filename='agent_builder.log', level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
-def scrape_headlines(url):
+PDF_SUMMARY_WORDS = 100
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 0)) or None
+PDF_MAX_BYTES = int(os.getenv('PDF_MAX_BYTES', 0)) or None
+
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 10))
+HEADLINES_TTL = float(os.getenv('HEADLINES_TTL_SECONDS', 60))
+HEADLINES_ENGINE = os.getenv('HEADLINES_ENGINE', 'soup')
+HEADLINES_LIMIT = 5
+
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 20))
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """One pooled session shared by every agent so repeated fetches reuse TCP/TLS connections."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+            session.mount('https://', HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+            _http_session = session
+        return _http_session
+
+TWITTER_API_HOST = os.getenv('TWITTER_API_HOST', 'api.twitter.com')
+TWEETS_COUNT = 5
+
+def _twitter_client():
+    # Authenticate with Twitter API v1.1 using tweepy
+    import tweepy
+    auth = tweepy.OAuthHandler(os.getenv('TWITTER_CONSUMER_KEY'), os.getenv('TWITTER_CONSUMER_SECRET'))
+    auth.set_access_token(os.getenv('TWITTER_ACCESS_TOKEN'), os.getenv('TWITTER_ACCESS_TOKEN_SECRET'))
+    return tweepy.API(auth, host=TWITTER_API_HOST, timeout=HTTP_TIMEOUT)
+
+# One client and tweet cache shared by every agent, so agents watching the same user
+# share fetches and each refresh only downloads tweets newer than the cached ones
+tweet_timelines = TimelineCache(
+    _twitter_client,
+    count=TWEETS_COUNT,
+    ttl=float(os.getenv('TWEETS_TTL_SECONDS', 60)),
+    max_users=int(os.getenv('TWEETS_CACHE_USERS', 1024)),
+    min_remaining=int(os.getenv('TWITTER_RATE_LIMIT_RESERVE', 1))
+)
+
+SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'true').lower() in ('1', 'true', 'yes')
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 4))
+SMTP_ASYNC = os.getenv('SMTP_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+SMTP_FLUSH_SECONDS = float(os.getenv('SMTP_FLUSH_SECONDS', 30))
+
+_smtp_pools = {}
+_smtp_outboxes = {}
+_smtp_lock = threading.Lock()
+
+_headline_cache = {}
+_headline_cache_lock = threading.Lock()
+HEADLINE_CACHE_REQUESTS = metrics.Counter('headline_cache_requests_total', 'Headline fetches by cache outcome', ('result',))
+
+pdf_cache = PDFCache(os.getenv('PDF_CACHE_DIR', 'pdf_cache'), int(os.getenv('PDF_CACHE_MAX_BYTES', 64 * 1024 * 1024)))
+
+class _HeadlineParser(HTMLParser):
+    """Collects the first link of each tr.athing > span.titleline and stops after the limit."""
+
+    class Done(Exception):
+        pass
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.headlines = []
+        self._in_athing = False
+        # Open spans from span.titleline down, so the flag ends with the span itself
+        self._titleline_depth = 0
+        self._text = None
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get('class') or '').split()
+        if tag == 'tr':
+            self._in_athing = 'athing' in classes
+            self._titleline_depth = 0
+        elif tag == 'span' and self._titleline_depth:
+            self._titleline_depth += 1
+        elif tag == 'span' and self._in_athing and 'titleline' in classes:
+            self._titleline_depth = 1
+        elif tag == 'a' and self._titleline_depth and self._text is None:
+            self._text = []
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._text is not None:
+            self.headlines.append(''.join(self._text).strip())
+            self._text = None
+            self._titleline_depth = 0
+            self._in_athing = False
+            if len(self.headlines) >= self.limit:
+                raise self.Done()
+        elif tag == 'span' and self._titleline_depth:
+            self._titleline_depth -= 1
+        elif tag == 'tr':
+            self._in_athing = False
+            self._titleline_depth = 0
+
+def _parse_headlines_soup(html, limit):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    headlines = []
+    for item in soup.find_all('tr', class_='athing')[:limit]:
+        title = item.find('span', class_='titleline')
+        if title and title.a:
+            headlines.append(title.a.text.strip())
+    return headlines
+
+def _parse_headlines_strainer(html, limit):
+    from bs4 import BeautifulSoup, SoupStrainer
+    # Only span.titleline subtrees are built; HN renders them exclusively inside tr.athing rows
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('span', class_='titleline'))
+    return [title.a.text.strip() for title in soup.find_all('span', class_='titleline', limit=limit) if title.a]
+
+def _parse_headlines_stream(html, limit, chunk_size=16384):
+    parser = _HeadlineParser(limit)
     try:
-        response = requests.get(url)
+        for start in range(0, len(html), chunk_size):
+            parser.feed(html[start:start + chunk_size])
+        parser.close()
+    except _HeadlineParser.Done:
+        pass
+    return parser.headlines
+
+def _parse_headlines_lxml(html, limit):
+    if not LXML_AVAILABLE:
+        raise ValueError("The lxml headline engine requires the lxml package")
+    import lxml.html
+    links = lxml.html.fromstring(html).xpath(
+        "//tr[contains(concat(' ', normalize-space(@class), ' '), ' athing ')]"
+        "//span[contains(concat(' ', normalize-space(@class), ' '), ' titleline ')]/a[1]"
+    )
+    return [link.text_content().strip() for link in links[:limit]]
+
+headline_engines = {
+    "soup": _parse_headlines_soup,
+    "strainer": _parse_headlines_strainer,
+    "stream": _parse_headlines_stream,
+    "lxml": _parse_headlines_lxml
+}
+
+def parse_headlines(html, limit=HEADLINES_LIMIT, engine=None):
+    engine = engine or HEADLINES_ENGINE
+    if engine not in headline_engines:
+        raise ValueError(f"Unknown headline engine '{engine}'. Choose from: {', '.join(headline_engines)}")
+    return headline_engines[engine](html, limit)
+
+def fetch_headlines(url, limit=HEADLINES_LIMIT, engine=None):
+    cache_key = (url, limit)
+    with _headline_cache_lock:
+        cached = _headline_cache.get(cache_key)
+    if cached and time.monotonic() - cached['fetched_at'] < HEADLINES_TTL:
+        HEADLINE_CACHE_REQUESTS.inc('hit')
+        return cached['headlines']
+
+    headers = {}
+    if cached and cached['etag']:
+        headers['If-None-Match'] = cached['etag']
+    if cached and cached['last_modified']:
+        headers['If-Modified-Since'] = cached['last_modified']
+    response = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and cached:
+        logger.info(f"Headlines at {url} not modified, reusing cached copy")
+        HEADLINE_CACHE_REQUESTS.inc('revalidated')
+        headlines = cached['headlines']
+    else:
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        headlines = []
-        for item in soup.find_all('tr', class_='athing')[:5]:
-            title = item.find('span', class_='titleline')
-            if title and title.a:
-                headlines.append(title.a.text.strip())
+        HEADLINE_CACHE_REQUESTS.inc('miss')
+        headlines = parse_headlines(response.text, limit, engine)
+    with _headline_cache_lock:
+        _headline_cache[cache_key] = {
+            'headlines': headlines,
+            'etag': response.headers.get('ETag') or (cached and cached['etag']),
+            'last_modified': response.headers.get('Last-Modified') or (cached and cached['last_modified']),
+            'fetched_at': time.monotonic()
+        }
+    return headlines
+
+def _scrape_headlines(url, limit=HEADLINES_LIMIT, engine=None):
+    try:
+        headlines = fetch_headlines(url, limit, engine)
         if not headlines:
-            return "No headlines found."
-        return '\n'.join([f"{i+1}. {headline}" for i, headline in enumerate(headlines)])
+            return {"output": "No headlines found."}
+        return {"output": '\n'.join([f"{i+1}. {headline}" for i, headline in enumerate(headlines)])}
     except Exception as e:
         logger.error(f"Error scraping headlines from {url}: {str(e)}")
-        return f"Error scraping headlines: {str(e)}"
+        return {"output": f"Error scraping headlines: {str(e)}", "error": True}
 
-def send_email(recipient, subject, body):
+def scrape_headlines(url, limit=HEADLINES_LIMIT, engine=None):
+    return _scrape_headlines(url, limit, engine)["output"]
+
+def _smtp_pool(smtp_email, smtp_password):
+    key = (smtp_email, smtp_password)
+    with _smtp_lock:
+        if key not in _smtp_pools:
+            _smtp_pools[key] = SMTPPool(SMTP_HOST, SMTP_PORT, smtp_email, smtp_password, size=SMTP_POOL_SIZE, starttls=SMTP_STARTTLS)
+        return _smtp_pools[key]
+
+def _smtp_outbox(smtp_email, smtp_password):
+    pool = _smtp_pool(smtp_email, smtp_password)
+    with _smtp_lock:
+        if pool not in _smtp_outboxes:
+            _smtp_outboxes[pool] = Outbox(pool)
+        return _smtp_outboxes[pool]
+
+def flush_outboxes(timeout=SMTP_FLUSH_SECONDS):
+    """Deliver the queued emails before shutdown; the outbox threads are daemons and would drop them."""
+    with _smtp_lock:
+        outboxes = list(_smtp_outboxes.values())
+    deadline = time.monotonic() + timeout
+    for outbox in outboxes:
+        if not outbox.flush(max(0, deadline - time.monotonic())):
+            logger.error(f"Timed out after {timeout}s delivering queued emails")
+            return False
+    return True
+
+atexit.register(flush_outboxes)
+
+def _build_email(sender, recipient, subject, body):
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = recipient
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+def _send_email(recipient, subject, body, wait=not SMTP_ASYNC):
     smtp_email = os.getenv('SMTP_EMAIL')
     smtp_password = os.getenv('SMTP_PASSWORD')
     
     if not smtp_email or not smtp_password:
         logger.info(f"SMTP credentials not provided. Mocking email to {recipient}")
-        return f"Email sent to {recipient} with subject '{subject}' (mock)"
+        return {"output": f"Email sent to {recipient} with subject '{subject}' (mock)"}
     
     try:
-        msg = MIMEMultipart()
-        msg['From'] = smtp_email
-        msg['To'] = recipient
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'plain'))
-        
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(smtp_email, smtp_password)
-            server.send_message(msg)
+        msg = _build_email(smtp_email, recipient, subject, body)
+        if not wait:
+            _smtp_outbox(smtp_email, smtp_password).put(msg)
+            logger.info(f"Email to {recipient} with subject '{subject}' queued")
+            return {"output": f"Email to {recipient} with subject '{subject}' queued for delivery"}
+
+        error = _smtp_pool(smtp_email, smtp_password).send_batch([msg])[0]
+        if error:
+            raise smtplib.SMTPException(error)
         logger.info(f"Email sent to {recipient} with subject '{subject}'")
-        return f"Email sent to {recipient} with subject '{subject}'"
+        return {"output": f"Email sent to {recipient} with subject '{subject}'"}
     except Exception as e:
         logger.error(f"Error sending email to {recipient}: {str(e)}")
-        return f"Error sending email: {str(e)}"
+        return {"output": f"Error sending email: {str(e)}", "error": True}
+
+def send_email(recipient, subject, body, wait=not SMTP_ASYNC):
+    return _send_email(recipient, subject, body, wait)["output"]
+
+def send_emails(emails):
+    """Send a list of {"recipient", "subject", "body"} dicts over a single SMTP session."""
+    smtp_email = os.getenv('SMTP_EMAIL')
+    smtp_password = os.getenv('SMTP_PASSWORD')
+
+    if not smtp_email or not smtp_password:
+        logger.info(f"SMTP credentials not provided. Mocking {len(emails)} emails")
+        return [f"Email sent to {email['recipient']} with subject '{email['subject']}' (mock)" for email in emails]
+
+    try:
+        messages = [_build_email(smtp_email, email['recipient'], email['subject'], email['body']) for email in emails]
+        errors = _smtp_pool(smtp_email, smtp_password).send_batch(messages)
+    except Exception as e:
+        logger.error(f"Error sending {len(emails)} emails: {str(e)}")
+        return [f"Error sending email: {str(e)}"] * len(emails)
+    results = []
+    for email, error in zip(emails, errors):
+        if error:
+            logger.error(f"Error sending email to {email['recipient']}: {error}")
+            results.append(f"Error sending email: {error}")
+        else:
+            results.append(f"Email sent to {email['recipient']} with subject '{email['subject']}'")
+    logger.info(f"Sent batch of {len(emails)} emails")
+    return results
 
 def scrape_tweets(username):
     try:
@@ -66,73 +325,147 @@ def scrape_tweets(username):
 
         if not all([consumer_key, consumer_secret, access_token, access_token_secret]):
             logger.error("Twitter API credentials missing")
-            return {"output": "Error: Twitter API credentials missing"}
-
-        # Authenticate with Twitter API v1.1 using tweepy
-        auth = tweepy.OAuthHandler(consumer_key, consumer_secret)
-        auth.set_access_token(access_token, access_token_secret)
-        api = tweepy.API(auth)
+            return {"output": "Error: Twitter API credentials missing", "error": True}
 
         # Remove leading '@' if present
         username = username.lstrip('@')
         logger.info(f"Scraping tweets for {username}")
 
-        # Fetch the user's recent tweets (up to 5)
-        tweets = api.user_timeline(screen_name=username, count=5, tweet_mode="extended")
+        # The user's recent tweets (up to 5), fetched incrementally through the shared cache
+        tweets = tweet_timelines.timeline(username)
         if not tweets:
             logger.info(f"No tweets found for {username}")
             return {"output": f"No tweets found for {username}"}
 
-        # Extract tweet text
-        tweet_texts = []
-        for i, tweet in enumerate(tweets, 1):
-            # Handle retweets and full text
-            if hasattr(tweet, 'retweeted_status'):
-                text = f"RT @{tweet.retweeted_status.user.screen_name}: {tweet.retweeted_status.full_text}"
-            else:
-                text = tweet.full_text
-            tweet_texts.append(f"{i}. {text}")
+        tweet_texts = [f"{i}. {text}" for i, (_, text) in enumerate(tweets, 1)]
         result = '\n'.join(tweet_texts)
         logger.info(f"Successfully scraped tweets for {username}: {result}")
         return {"output": result}
     except Exception as e:
         logger.error(f"Error scraping tweets for {username}: {str(e)}")
-        return {"output": f"Error scraping tweets: {str(e)}"}
+        return {"output": f"Error scraping tweets: {str(e)}", "error": True}
+
+def extract_pdf_text(file_path, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Yield the text of each page, stopping once the page or byte budget is spent."""
+    from PyPDF2 import PdfReader
+    extracted_bytes = 0
+    with open(file_path, 'rb') as file:
+        pdf_reader = PdfReader(file)
+        for page_number, page in enumerate(pdf_reader.pages):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            page_text = page.extract_text()
+            if not page_text:
+                continue
+            if max_bytes is not None:
+                encoded = page_text.encode('utf-8')
+                remaining = max_bytes - extracted_bytes
+                if len(encoded) > remaining:
+                    page_text = encoded[:remaining].decode('utf-8', errors='ignore')
+                extracted_bytes += len(encoded)
+            if page_text:
+                yield page_text
+            if max_bytes is not None and extracted_bytes >= max_bytes:
+                break
+
+def iter_pdf_words(file_path, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    with closing(extract_pdf_text(file_path, max_pages, max_bytes)) as pages:
+        for page_text in pages:
+            yield from page_text.split()
+
+@lru_cache(maxsize=4096)
+def _pdf_digest(file_path, size, mtime):
+    return hash_file(file_path)
+
+def pdf_digest(file_path):
+    stat = os.stat(file_path)
+    return _pdf_digest(os.path.abspath(file_path), stat.st_size, stat.st_mtime)
 
-def summarize_pdf(file_path):
+def summarize_pdf(file_path, max_words=PDF_SUMMARY_WORDS, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES, stream=False):
     try:
         logger.info(f"Reading PDF from {file_path}")
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ''
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + ' '
-
-        if not text.strip():
+        if stream:
+            # Reading the first page opens and parses the file here, so a missing or corrupt
+            # PDF is reported like on every other path rather than while the caller iterates
+            pages = extract_pdf_text(file_path, max_pages, max_bytes)
+            first_page = next(pages, None)
+            return {"output": chain([first_page] if first_page is not None else [], pages)}
+
+        cache_key = f"{pdf_digest(file_path)}-{max_words}-{max_pages}-{max_bytes}"
+        cached = pdf_cache.get(cache_key)
+        if cached:
+            logger.info(f"Using cached summary for PDF at {file_path}")
+            return {"output": f"Summary of PDF at {file_path}:\n{cached['summary']}"}
+
+        # Simple summarization: Take the first max_words words, reading one extra
+        # word to know whether to mark the summary as truncated
+        with closing(iter_pdf_words(file_path, max_pages, max_bytes)) as words:
+            summary_words = list(islice(words, max_words + 1))
+
+        if not summary_words:
             logger.warning(f"No text extracted from PDF at {file_path}")
-            return {"output": "Error: No text could be extracted from the PDF"}
+            return {"output": "Error: No text could be extracted from the PDF", "error": True}
 
-        # Simple summarization: Take the first 100 words (or less if the text is shorter)
-        words = text.split()
-        summary_length = min(100, len(words))
-        summary = ' '.join(words[:summary_length])
-        if len(words) > summary_length:
+        summary = ' '.join(summary_words[:max_words])
+        if len(summary_words) > max_words:
             summary += "..."
+        pdf_cache.put(cache_key, {'summary': summary})
         logger.info(f"Generated summary for PDF at {file_path}: {summary}")
         return {"output": f"Summary of PDF at {file_path}:\n{summary}"}
     except Exception as e:
         logger.error(f"Error summarizing PDF at {file_path}: {str(e)}")
-        return {"output": f"Error summarizing PDF: {str(e)}"}
+        return {"output": f"Error summarizing PDF: {str(e)}", "error": True}
+
+def _summarize_pdf_tool(input):
+    return summarize_pdf(
+        input.get("file_path", ""),
+        max_pages=input.get("max_pages", PDF_MAX_PAGES),
+        max_bytes=input.get("max_bytes", PDF_MAX_BYTES),
+        stream=input.get("stream", False)
+    )
 
-available_tools = {
-    "scrape_headlines": lambda input: {"output": scrape_headlines(input.get("url", ""))},
-    "send_email": lambda input: {"output": send_email(
+# Shared by every agent so identical calls within the TTL, or made concurrently, hit the
+# upstream once. summarize_pdf has its own digest-keyed cache, so it is only coalesced,
+# and send_email is never wrapped because each call must deliver a message.
+TOOL_CACHE_TTL = float(os.getenv('TOOL_CACHE_TTL_SECONDS', 60))
+tool_cache = ToolCache(
+    {"scrape_headlines": TOOL_CACHE_TTL, "scrape_tweets": TOOL_CACHE_TTL, "summarize_pdf": 0},
+    maxsize=int(os.getenv('TOOL_CACHE_SIZE', 1024))
+)
+_cached_scrape_headlines = tool_cache.wrap("scrape_headlines", lambda input: _scrape_headlines(
+    input.get("url", ""),
+    input.get("limit", HEADLINES_LIMIT),
+    input.get("engine")
+))
+_cached_scrape_tweets = tool_cache.wrap("scrape_tweets", lambda input: scrape_tweets(input.get("username", "")))
+_cached_summarize_pdf = tool_cache.wrap("summarize_pdf", _summarize_pdf_tool)
+
+metrics.CallbackMetric(
+    'tool_cache_requests_total', 'Shared tool cache lookups by outcome', 'counter', ('result',),
+    lambda: {(result,): tool_cache.stats()[result] for result in ('hits', 'misses', 'coalesced')}
+)
+metrics.CallbackMetric(
+    'pdf_cache_requests_total', 'PDF summary cache lookups by outcome', 'counter', ('result',),
+    lambda: {(result,): pdf_cache.stats()[result] for result in ('hits', 'misses')}
+)
+metrics.CallbackMetric(
+    'twitter_timeline_requests_total', 'Tweet timeline lookups by outcome', 'counter', ('result',),
+    lambda: {(result,): tweet_timelines.stats()[result] for result in ('hit', 'fetched', 'rate_limited')}
+)
+metrics.CallbackMetric(
+    'twitter_rate_limit_remaining', 'Calls left in the current Twitter rate-limit window', 'gauge', (),
+    lambda: {(): tweet_timelines.remaining} if tweet_timelines.remaining is not None else {}
+)
+metrics.CallbackMetric('pdf_cache_bytes', 'Size of the PDF summary cache on disk', 'gauge', (), lambda: {(): pdf_cache.stats()['bytes']})
+
+available_tools = {name: metrics.instrument_tool(name, tool) for name, tool in {
+    "scrape_headlines": _cached_scrape_headlines,
+    "send_email": lambda input: _send_email(
         input.get("recipient", ""),
         input.get("subject", ""),
         input.get("body", "")
-    )},
-    "scrape_tweets": lambda input: scrape_tweets(input.get("username", "")),
-    "summarize_pdf": lambda input: summarize_pdf(input.get("file_path", ""))
-}
+    ),
+    "scrape_tweets": _cached_scrape_tweets,
+    # Streamed text is a one-shot iterator, so it cannot be shared between callers
+    "summarize_pdf": lambda input: (_summarize_pdf_tool if input.get("stream") else _cached_summarize_pdf)(input)
+}.items()}
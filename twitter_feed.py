@@ -0,0 +1,118 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class RateLimited(Exception):
+    pass
+
+class TimelineCache:
+    """Recent tweets per user, shared by every agent and refreshed incrementally.
+
+    All fetches go through one tweepy client. A refresh asks only for tweets newer than the
+    newest one cached (since_id), callers asking for the same user while a refresh is in
+    flight or within ttl seconds of it share its result, and once the rate-limit window is
+    down to min_remaining calls the cached timeline is served until the window resets.
+    """
+
+    def __init__(self, client_factory, count=5, ttl=60, max_users=1024, min_remaining=1):
+        self.client_factory = client_factory
+        self.count = count
+        self.ttl = ttl
+        self.max_users = max_users
+        self.min_remaining = min_remaining
+        self.remaining = None
+        self.reset_at = 0
+        self.requests = {'hit': 0, 'fetched': 0, 'rate_limited': 0}
+        self._client = None
+        self._timelines = OrderedDict()
+        self._user_locks = {}
+        self._lock = threading.Lock()
+
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self.client_factory()
+                # Read rate-limit headers from every response; tweepy only keeps the last one
+                self._client.session.hooks['response'].append(self._track_rate_limit)
+            return self._client
+
+    def _track_rate_limit(self, response, *args, **kwargs):
+        remaining = response.headers.get('x-rate-limit-remaining')
+        reset = response.headers.get('x-rate-limit-reset')
+        with self._lock:
+            if response.status_code == 429:
+                self.remaining = 0
+            elif remaining is not None:
+                self.remaining = int(remaining)
+            else:
+                return
+            self.reset_at = int(reset) if reset else time.time() + 60
+
+    def rate_limited(self):
+        return self.remaining is not None and self.remaining <= self.min_remaining and time.time() < self.reset_at
+
+    def timeline(self, screen_name):
+        """Return up to count (tweet_id, text) pairs for the user, newest first."""
+        key = screen_name.lower()
+        with self._lock:
+            user_lock = self._user_locks.setdefault(key, threading.Lock())
+        with user_lock:
+            with self._lock:
+                cached = self._timelines.get(key)
+                if cached:
+                    self._timelines.move_to_end(key)
+            if cached and time.monotonic() - cached['fetched_at'] < self.ttl:
+                self._count('hit')
+                return cached['tweets']
+            if self.rate_limited():
+                self._count('rate_limited')
+                if cached:
+                    logger.warning(f"Twitter rate limit nearly spent, serving cached tweets for {screen_name}")
+                    return cached['tweets']
+                raise RateLimited(f"Twitter rate limit reached, resets at {time.strftime('%H:%M:%S', time.localtime(self.reset_at))}")
+
+            try:
+                tweets = self._fetch(screen_name, cached['tweets'][0][0] if cached and cached['tweets'] else None)
+            except Exception:
+                if cached and self.rate_limited():
+                    self._count('rate_limited')
+                    logger.warning(f"Twitter rate limit reached, serving cached tweets for {screen_name}")
+                    return cached['tweets']
+                raise
+            if cached:
+                tweets = (tweets + cached['tweets'])[:self.count]
+            self._count('fetched')
+            with self._lock:
+                self._timelines[key] = {'tweets': tweets, 'fetched_at': time.monotonic()}
+                self._timelines.move_to_end(key)
+                while len(self._timelines) > self.max_users:
+                    evicted, _ = self._timelines.popitem(last=False)
+                    self._user_locks.pop(evicted, None)
+            return tweets
+
+    def _fetch(self, screen_name, since_id):
+        kwargs = {'screen_name': screen_name, 'count': self.count, 'tweet_mode': 'extended'}
+        if since_id:
+            kwargs['since_id'] = since_id
+        statuses = self.client().user_timeline(**kwargs)
+        logger.info(f"Fetched {len(statuses)} new tweets for {screen_name}" + (f" since {since_id}" if since_id else ""))
+        tweets = []
+        for status in statuses:
+            # Handle retweets and full text
+            if hasattr(status, 'retweeted_status'):
+                text = f"RT @{status.retweeted_status.user.screen_name}: {status.retweeted_status.full_text}"
+            else:
+                text = status.full_text
+            tweets.append((status.id, text))
+        return tweets
+
+    def _count(self, result):
+        with self._lock:
+            self.requests[result] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.requests, users=len(self._timelines), remaining=self.remaining)
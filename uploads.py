@@ -0,0 +1,175 @@
+import os
+import re
+import time
+import uuid
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from file_index import CHUNK_SIZE, hash_file
+from file_lock import lock_file
+
+logger = logging.getLogger(__name__)
+
+# PDF readers accept the header anywhere in the first 1024 bytes
+PDF_HEADER = b'%PDF-'
+PDF_HEADER_WINDOW = 1024
+
+class UploadTooLarge(Exception):
+    pass
+
+class HashingFile:
+    """Temp file in the upload folder that hashes and size-checks bytes as they are written."""
+
+    def __init__(self, folder, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.md5()
+        self._committed = False
+        self._file = tempfile.NamedTemporaryFile(dir=folder, prefix='.upload-', suffix='.part', delete=False)
+        self.path = self._file.name
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_bytes and self.size > self.max_bytes:
+            raise UploadTooLarge(f"Upload exceeds the {self.max_bytes} byte limit")
+        self._hash.update(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def commit(self, dest_path):
+        self._file.close()
+        os.replace(self.path, dest_path)
+        self._committed = True
+
+    def discard(self):
+        if self._committed:
+            return
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __getattr__(self, name):
+        # Werkzeug seeks, reads and closes the stream after parsing
+        return getattr(self._file, name)
+
+def copy_stream(stream, dest, chunk_size=CHUNK_SIZE):
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        dest.write(chunk)
+
+class ChunkedUploads:
+    """Resumable uploads assembled from sequential chunks in a hidden folder under the upload folder."""
+
+    UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+
+    def __init__(self, folder, max_bytes, ttl=24 * 3600):
+        self.folder = os.path.join(folder, '.partial')
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # Running digests for sessions handled by this process; others are rehashed on completion
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._append_lock = threading.Lock()
+        os.makedirs(self.folder, exist_ok=True)
+
+    def _path(self, upload_id):
+        if not self.UPLOAD_ID.match(upload_id or ''):
+            raise KeyError(upload_id)
+        return os.path.join(self.folder, f"{upload_id}.part")
+
+    def create(self):
+        self._expire()
+        upload_id = uuid.uuid4().hex
+        open(self._path(upload_id), 'wb').close()
+        with self._lock:
+            self._hashes[upload_id] = (hashlib.md5(), 0)
+        logger.info(f"Started chunked upload {upload_id}")
+        return upload_id
+
+    def offset(self, upload_id):
+        try:
+            return os.path.getsize(self._path(upload_id))
+        except OSError:
+            raise KeyError(upload_id)
+
+    @contextmanager
+    def _locked(self, upload_id):
+        """Open the part file with an exclusive lock, held across workers where flock is available."""
+        try:
+            f = open(self._path(upload_id), 'r+b')
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        with f:
+            if lock_file(f):
+                yield f
+            else:
+                with self._append_lock:
+                    yield f
+
+    def append(self, upload_id, offset, stream):
+        """Append a chunk written at offset and return the new offset; raises ValueError on an offset mismatch."""
+        with self._locked(upload_id) as f:
+            # Checked under the lock so a retried chunk racing the original is rejected, not appended twice
+            current = os.fstat(f.fileno()).st_size
+            if offset != current:
+                raise ValueError(current)
+            with self._lock:
+                digest, hashed = self._hashes.pop(upload_id, (None, None))
+            if hashed != current:
+                digest = None
+            f.seek(current)
+            try:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    current += len(chunk)
+                    if self.max_bytes and current > self.max_bytes:
+                        raise UploadTooLarge(f"Upload exceeds the {self.max_bytes} byte limit")
+                    f.write(chunk)
+                    if digest:
+                        digest.update(chunk)
+            except BaseException:
+                # Drop the partial chunk so the client can resend it from the same offset
+                f.truncate(offset)
+                raise
+        if digest:
+            with self._lock:
+                self._hashes[upload_id] = (digest, current)
+        return current
+
+    def complete(self, upload_id):
+        """Return the part file path and its digest; the caller moves or discards the file.
+
+        Raises ValueError if the assembled file does not start with a PDF header.
+        """
+        path = self._path(upload_id)
+        with self._locked(upload_id) as f:
+            if PDF_HEADER not in f.read(PDF_HEADER_WINDOW):
+                raise ValueError(f"Upload {upload_id} is not a PDF")
+            size = os.fstat(f.fileno()).st_size
+            with self._lock:
+                digest, hashed = self._hashes.pop(upload_id, (None, None))
+            file_hash = digest.hexdigest() if digest and hashed == size else hash_file(path)
+        return path, file_hash
+
+    def discard(self, upload_id):
+        with self._lock:
+            self._hashes.pop(upload_id, None)
+        try:
+            os.remove(self._path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for entry in os.scandir(self.folder):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    with self._lock:
+                        self._hashes.pop(entry.name[:-len('.part')], None)
+            except OSError:
+                continue